@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from .database import database_settings
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -45,11 +48,13 @@ INSTALLED_APPS = [
 
 
 MIDDLEWARE = [
+    'advanced_api_project.database.DatabaseMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'api.routers.ReplicaPinningMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -77,12 +82,30 @@ WSGI_APPLICATION = 'advanced_api_project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# DATABASE_PROFILE=dev (SQLite, the default), persistent or pooled (PostgreSQL at
+# DATABASE_URL); see advanced_api_project/database.py for the pool and lifetime knobs
 DATABASES = {
-    'default': {
+    'default': database_settings(BASE_DIR),
+}
+
+# Seconds between the connection and pool metrics DatabaseMetricsMiddleware logs
+DATABASE_METRICS_INTERVAL = 60
+
+# Read replicas: with API_READ_REPLICAS=1, reads of the api models go to a second
+# SQLite file that `manage.py replicate` copies from the primary (a stand-in for real
+# replication). Clients that just wrote read from the primary for REPLICA_PIN_SECONDS.
+DATABASE_REPLICAS = []
+if os.environ.get('API_READ_REPLICAS'):
+    DATABASES['replica'] = {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': BASE_DIR / 'db_replica.sqlite3',
+        'TEST': {'MIRROR': 'default'},
     }
-}
+    DATABASE_REPLICAS = ['replica']
+
+DATABASE_ROUTERS = ['api.routers.PrimaryReplicaRouter']
+
+REPLICA_PIN_SECONDS = 5
 
 
 # Password validation
@@ -126,9 +149,53 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# The catalog version (api/caching.py) and the cached responses live in this cache, so
+# every process serving the API must share it: with CACHE_URL=redis://... or
+# memcached://host:port they do. The local-memory fallback is per process and only
+# safe with a single worker (runserver, tests); a write in one worker would leave the
+# others serving stale lists and ETags. api.W003 warns about it when DEBUG is off.
+CACHE_BACKENDS = {
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'rediss': 'django.core.cache.backends.redis.RedisCache',
+    'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',
+}
+CACHE_URL = os.environ.get('CACHE_URL', '')
+if CACHE_URL:
+    scheme, _, address = CACHE_URL.partition('://')
+    CACHES = {
+        'default': {
+            'BACKEND': CACHE_BACKENDS[scheme],
+            'LOCATION': CACHE_URL if scheme.startswith('redis') else address,
+            'KEY_PREFIX': 'advanced-api-project',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'advanced-api-project',
+        }
+    }
+
 REST_FRAMEWORK = {
+    # Basic first, so unauthenticated requests get a 401 with WWW-Authenticate
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'rest_framework.authentication.BasicAuthentication',
+        'rest_framework.authentication.SessionAuthentication',
+    ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
-    ]
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'PAGE_SIZE': 20,
 }
 
+# Performance budgets declared on the views with @budget; see advanced_api_project/budgets.py
+TEST_RUNNER = 'advanced_api_project.budgets.BudgetTestRunner'
+BUDGET_SEED = 'api.budgets.seed'
+BUDGET_CLIENT = 'rest_framework.test.APIClient'
+BUDGET_REPEAT = 5
+BUDGET_HISTORY = BASE_DIR / 'budget_history.jsonl'
+# Scales every latency budget, for machines slower than the ones budgets were set
+# on; CI runners (CI set) default to 3
+BUDGET_LATENCY_FACTOR = float(os.environ.get('BUDGET_LATENCY_FACTOR', 3 if os.environ.get('CI') else 1))
@@ -0,0 +1,19 @@
+from django.contrib.auth.models import User
+
+from .models import Author, Book
+
+AUTHORS = 50
+BOOKS_PER_AUTHOR = 20
+
+
+def seed():
+    """Data the performance budgets are checked against: a 1,000 book catalog."""
+    authors = Author.objects.bulk_create(Author(name=f'Author {i}') for i in range(AUTHORS))
+    Book.objects.bulk_create(
+        Book(title=f'Book {i} by {author.name}', publication_year=1900 + (i * 7 + author.pk) % 120, author=author)
+        for author in authors
+        for i in range(BOOKS_PER_AUTHOR)
+    )
+    # Unusable password: keeps the password hasher out of the seeding time
+    user = User.objects.create(username='budget-reader', password='!')
+    return {'user': user, 'author': authors[0], 'book': Book.objects.order_by('pk').first()}
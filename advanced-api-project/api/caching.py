@@ -0,0 +1,83 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag, urlencode
+from rest_framework.response import Response
+
+from .routers import is_pinned
+
+# Seconds a serialized response stays in the cache (entries of older catalog
+# versions are never read again and simply expire)
+RESPONSE_CACHE_TIMEOUT = 300
+
+CATALOG_VERSION_KEY = 'api:catalog:version'
+
+
+# --------------------------
+# Catalog version
+# --------------------------
+# A counter in the cache that changes on every Book/Author write. List ETags and cache
+# keys include it, so a write invalidates every cached list at once.
+
+def _fresh_version():
+    # Starting from the clock keeps a version lost with the cache from being reused
+    return time.time_ns() // 1000
+
+
+def catalog_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, _fresh_version(), None)
+        version = cache.get(CATALOG_VERSION_KEY, _fresh_version())
+    return version
+
+
+def _incr_catalog_version():
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.set(CATALOG_VERSION_KEY, _fresh_version(), None)
+
+
+def bump_catalog_version():
+    # Bumped again on commit so nothing cached while the write was in flight is served
+    _incr_catalog_version()
+    transaction.on_commit(_incr_catalog_version)
+
+
+# --------------------------
+# Conditional, cached responses
+# --------------------------
+def request_signature(request, exclude=()):
+    """Digest of what shapes a response besides the data: params, host and format."""
+    params = urlencode(sorted(
+        (key, value) for key, values in request.query_params.lists() for value in values
+        if value != '' and key not in exclude
+    ))
+    accepted = getattr(request, 'accepted_renderer', None)
+    raw = f'{request.get_host()}|{accepted.format if accepted else ""}|{params}'
+    return hashlib.md5(raw.encode()).hexdigest()[:16]
+
+
+def cached_response(request, etag, build, timeout=RESPONSE_CACHE_TIMEOUT):
+    """Answer a GET from its ETag: 304 when the client has it, else the cached data.
+
+    `build` returns the response data and is only called on a cache miss; the ETag
+    must change whenever that data would. Requests pinned to the primary skip the
+    cache, whose entries may have been built from a lagging replica.
+    """
+    etag = quote_etag(etag)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        key = f'api:response:{etag}'
+        data = None if is_pinned() else cache.get(key)
+        if data is None:
+            data = build()
+            cache.set(key, data, timeout)
+        response = Response(data)
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
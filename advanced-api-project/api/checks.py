@@ -0,0 +1,99 @@
+from django.conf import settings
+from django.core.checks import Warning, register, Tags
+from django.db.models import F
+from django.db.models.functions import Lower
+
+# Lookups a B-tree index on the column can serve. Case-insensitive lookups compare
+# UPPER()/LIKE of the column and contains/endswith/regex match anywhere in it, so
+# none of those can use a plain index.
+INDEXED_LOOKUPS = {'exact', 'in', 'gt', 'gte', 'lt', 'lte', 'range', 'isnull', 'startswith'}
+
+
+def _index_leading_fields(model):
+    # Fields that some index of `model` starts with
+    fields = {
+        field.name for field in model._meta.concrete_fields
+        if field.primary_key or field.unique or field.db_index
+    }
+    fields.update(index.fields[0].lstrip('-') for index in model._meta.indexes if index.fields)
+    fields.update(together[0] for together in model._meta.unique_together)
+    return fields
+
+
+def _lower_index_fields(model):
+    # Fields that some functional index of `model` starts with Lower() of
+    fields = set()
+    for index in model._meta.indexes:
+        if index.expressions and isinstance(index.expressions[0], Lower):
+            source = index.expressions[0].get_source_expressions()[0]
+            if isinstance(source, F):
+                fields.add(source.name)
+    return fields
+
+
+def has_supporting_index(model, path, lookup_expr='exact', lower=False):
+    """
+    Whether filtering/ordering `model` on `path` (e.g. 'author__name') with
+    `lookup_expr` can use indexes; with lower=True the lookup is made on Lower() of
+    the field (see api.filters.LowerFilter), which needs a Lower() index.
+    """
+    if lookup_expr not in INDEXED_LOOKUPS:
+        return False
+    *relations, name = path.split('__')
+    for relation in relations:
+        if relation not in _index_leading_fields(model):
+            return False
+        model = model._meta.get_field(relation).related_model
+    return name in (_lower_index_fields(model) if lower else _index_leading_fields(model))
+
+
+@register(Tags.models)
+def check_filter_indexes(app_configs, **kwargs):
+    """Warn about filter and ordering fields of the api views that no index supports."""
+    from . import views
+    from .filters import LowerFilter
+
+    warnings = []
+    for view in vars(views).values():
+        model = getattr(getattr(view, 'queryset', None), 'model', None)
+        if model is None:
+            continue
+        filterset = getattr(view, 'filterset_class', None)
+        if filterset is not None:
+            for name, filter_ in filterset.base_filters.items():
+                lower = isinstance(filter_, LowerFilter)
+                if not has_supporting_index(model, filter_.field_name, filter_.lookup_expr, lower):
+                    warnings.append(Warning(
+                        f"{filterset.__name__}.{name} filters on '{filter_.field_name}' with "
+                        f"'{filter_.lookup_expr}', which no index of {model.__name__} supports.",
+                        hint=(
+                            "Add a Meta.indexes entry starting with Lower() of that field." if lower else
+                            "Use an indexable lookup, and add db_index=True or a Meta.indexes entry "
+                            "starting with that field."
+                        ),
+                        obj=filterset,
+                        id='api.W001',
+                    ))
+        for field in getattr(view, 'ordering_fields', None) or []:
+            if field != '__all__' and not has_supporting_index(model, field):
+                warnings.append(Warning(
+                    f"{view.__name__} orders on '{field}', which no index of {model.__name__} supports.",
+                    hint="Add db_index=True or a Meta.indexes entry starting with that field.",
+                    obj=view,
+                    id='api.W002',
+                ))
+    return warnings
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Warn when the catalog version and response cache are kept per process."""
+    backend = settings.CACHES['default']['BACKEND']
+    if settings.DEBUG or not backend.endswith('LocMemCache'):
+        return []
+    return [Warning(
+        "The default cache is per process, so a catalog write only invalidates the "
+        "cached lists and ETags of the worker that made it.",
+        hint="Set CACHE_URL to a redis:// or memcached:// cache shared by every worker.",
+        id='api.W003',
+    )]
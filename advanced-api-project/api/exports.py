@@ -0,0 +1,55 @@
+import csv
+import json
+from itertools import islice
+
+# Rows fetched per round trip while streaming an export
+EXPORT_CHUNK_SIZE = 2000
+
+# (header, values_list lookup) of every exported column
+EXPORT_COLUMNS = (
+    ('id', 'id'),
+    ('title', 'title'),
+    ('publication_year', 'publication_year'),
+    ('author_id', 'author_id'),
+    ('author_name', 'author__name'),
+)
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class Echo:
+    """File-like object whose write() hands the line back instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    # iterator() uses a server-side cursor where the database has one and fetches
+    # chunk_size rows at a time, so memory doesn't grow with the catalog
+    return queryset.values_list(*(lookup for _, lookup in EXPORT_COLUMNS)).iterator(chunk_size=chunk_size)
+
+
+def _chunks(rows, size):
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def stream_csv(rows, chunk_size=EXPORT_CHUNK_SIZE):
+    writer = csv.writer(Echo())
+    yield writer.writerow([header for header, _ in EXPORT_COLUMNS])
+    for chunk in _chunks(rows, chunk_size):
+        yield ''.join(writer.writerow(row) for row in chunk)
+
+
+def stream_ndjson(rows, chunk_size=EXPORT_CHUNK_SIZE):
+    headers = [header for header, _ in EXPORT_COLUMNS]
+    for chunk in _chunks(rows, chunk_size):
+        yield ''.join(json.dumps(dict(zip(headers, row))) + '\n' for row in chunk)
+
+
+STREAMERS = {'csv': stream_csv, 'ndjson': stream_ndjson}
@@ -0,0 +1,52 @@
+from django.core.cache import cache
+from django.db.models import Count, F
+from django.db.models.functions import Floor
+from rest_framework.exceptions import ValidationError
+
+from .caching import RESPONSE_CACHE_TIMEOUT, catalog_version, request_signature
+
+# Most frequent authors returned by the author facet
+AUTHOR_FACET_SIZE = 50
+
+# Query parameters that page or order the list without changing which books match
+NON_FILTER_PARAMS = ('page', 'ordering', 'facets', 'format')
+
+
+# Each facet is one GROUP BY over the filtered books (ordering removed)
+def decade_facet(queryset):
+    decades = (queryset.order_by()
+               .annotate(decade=Floor(F('publication_year') / 10) * 10)
+               .values('decade').annotate(count=Count('id')).order_by('decade'))
+    return [{'value': row['decade'], 'count': row['count']} for row in decades]
+
+
+def author_facet(queryset):
+    authors = (queryset.order_by()
+               .values('author_id', 'author__name').annotate(count=Count('id'))
+               .order_by('-count', 'author__name')[:AUTHOR_FACET_SIZE])
+    return [{'value': row['author_id'], 'name': row['author__name'], 'count': row['count']} for row in authors]
+
+
+FACETS = {'decade': decade_facet, 'author': author_facet}
+
+
+def requested_facets(request):
+    names = [name for name in request.query_params.get('facets', '').split(',') if name]
+    unknown = sorted(set(names) - FACETS.keys())
+    if unknown:
+        raise ValidationError({'facets': [f"Unknown facet {name!r}; expected one of {', '.join(FACETS)}."
+                                          for name in unknown]})
+    return names
+
+
+def facet_counts(request, queryset, names):
+    """Counts for every facet in `names`, cached per catalog version and filter signature."""
+    signature = request_signature(request, exclude=NON_FILTER_PARAMS)
+    counts = {}
+    for name in names:
+        key = f'api:facets:{catalog_version()}:{signature}:{name}'
+        counts[name] = cache.get(key)
+        if counts[name] is None:
+            counts[name] = FACETS[name](queryset)
+            cache.set(key, counts[name], RESPONSE_CACHE_TIMEOUT)
+    return counts
@@ -0,0 +1,69 @@
+import django_filters
+from django.db.models import Q, Value
+from django.db.models.functions import Chr, Concat, Left, Lower, Ord, Right
+from rest_framework import filters
+from .models import Book
+
+
+class LowerFilter(django_filters.CharFilter):
+    """
+    Case-insensitive match on Lower(field_name), served by a Lower() index of the
+    field. lookup_expr is 'exact', or 'startswith' for a prefix match, which is
+    written as a range over the index instead of a LIKE no index can serve. The
+    value is lowered by the database too, so both sides fold the same characters
+    (SQLite's LOWER() only folds ASCII).
+    """
+
+    def filter(self, qs, value):
+        if value in django_filters.constants.EMPTY_VALUES:
+            return qs
+        alias = self.field_name.replace('__', '_') + '_lower'
+        qs = qs.alias(**{alias: Lower(self.field_name)})
+        lowered = Lower(Value(value))
+        if self.lookup_expr == 'startswith':
+            # Every string starting with `value` sorts between it and its successor
+            # (the last character bumped by one)
+            upper = Chr(Ord(Right(lowered, 1)) + 1)
+            if len(value) > 1:
+                upper = Concat(Left(lowered, len(value) - 1), upper)
+            return qs.filter(**{f'{alias}__gte': lowered, f'{alias}__lt': upper})
+        return qs.filter(**{f'{alias}__{self.lookup_expr}': lowered})
+
+
+class BookFilter(django_filters.FilterSet):
+    # Case-insensitive title prefix; ?search= still matches anywhere in the title
+    title = LowerFilter(lookup_expr='startswith')
+    author_name = LowerFilter(field_name='author__name', lookup_expr='exact')
+
+    class Meta:
+        model = Book
+        # Every field here needs an index starting with it (see api.checks)
+        fields = {
+            'author': ['exact'],
+            'publication_year': ['exact', 'gte', 'lte'],
+        }
+
+
+class BookSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter that also matches numeric terms exactly against the view's
+    `search_exact_fields` (e.g. a year), instead of running icontains on integers.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+        if not search_fields or not search_terms:
+            return queryset
+
+        lookups = [self.construct_search(str(field), queryset) for field in search_fields]
+        exact_fields = getattr(view, 'search_exact_fields', [])
+        for term in search_terms:
+            condition = Q()
+            for lookup in lookups:
+                condition |= Q(**{lookup: term})
+            if term.isdigit():
+                for field in exact_fields:
+                    condition |= Q(**{field: int(term)})
+            queryset = queryset.filter(condition)
+        return queryset
@@ -0,0 +1,219 @@
+import csv
+import io
+import json
+import re
+import time
+from datetime import date
+from itertools import islice
+
+from django.db import transaction
+
+from .models import Author, Book
+
+# Rows validated and written per transaction
+IMPORT_CHUNK_SIZE = 5000
+
+# Characters read at a time when parsing a JSON array
+READ_SIZE = 1 << 16
+
+# Author name -> id entries kept between chunks before the map is reset
+MAX_CACHED_AUTHORS = 100000
+
+# Row errors kept in the report (the rest are only counted)
+MAX_REPORTED_ERRORS = 100
+
+IMPORT_FORMATS = ('csv', 'ndjson', 'json')
+
+_WS = re.compile(r'[ \t\n\r]*')
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+# --------------------------
+# Reading
+# --------------------------
+# Every reader is a generator over a text stream, so input is parsed as it's consumed
+# instead of being loaded whole.
+
+def _read_csv(stream):
+    yield from csv.DictReader(stream)
+
+
+def _read_ndjson(stream):
+    for number, line in enumerate(stream, 1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ImportFormatError(f"Line {number}: {exc.msg}.")
+
+
+def _read_json_array(stream, read_size=READ_SIZE):
+    # Decodes one array element at a time with raw_decode(), reading more input
+    # whenever the buffered text ends inside an element
+    decoder = json.JSONDecoder()
+    buf, pos, eof = '', 0, False
+    expecting = '['
+    while True:
+        pos = _WS.match(buf, pos).end()
+        if pos == len(buf):
+            if eof:
+                raise ImportFormatError("Unexpected end of JSON input.")
+            buf, pos = stream.read(read_size), 0
+            eof = not buf
+            continue
+        char = buf[pos]
+        if expecting == '[':
+            if char != '[':
+                raise ImportFormatError("Expected a JSON array of objects.")
+            expecting, pos = 'first', pos + 1
+        elif char == ']' and expecting in ('first', ','):
+            return
+        elif expecting == ',':
+            if char != ',':
+                raise ImportFormatError("Expected ',' or ']' between array elements.")
+            expecting, pos = 'value', pos + 1
+        else:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                end = None
+            # A value that runs to the end of the buffer may continue in the next read
+            if end is None or (end == len(buf) and not eof):
+                if eof:
+                    raise ImportFormatError("Invalid JSON array element.")
+                more = stream.read(read_size)
+                buf, pos, eof = buf[pos:] + more, 0, not more
+                continue
+            yield value
+            expecting, pos = ',', end
+
+
+READERS = {'csv': _read_csv, 'ndjson': _read_ndjson, 'json': _read_json_array}
+
+
+def detect_format(filename, default='csv'):
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if extension == 'jsonl':
+        return 'ndjson'
+    return extension if extension in IMPORT_FORMATS else default
+
+
+def read_rows(stream, fmt):
+    """Yield the rows of a CSV, NDJSON or JSON array text stream as dicts."""
+    if fmt not in READERS:
+        raise ImportFormatError(f"Unknown format {fmt!r}; expected one of {', '.join(IMPORT_FORMATS)}.")
+    return READERS[fmt](stream)
+
+
+def text_stream(binary):
+    return io.TextIOWrapper(binary, encoding='utf-8-sig', newline='')
+
+
+# --------------------------
+# Importing
+# --------------------------
+class ImportReport:
+    def __init__(self):
+        self.rows = 0
+        self.books_created = 0
+        self.authors_created = 0
+        self.error_count = 0
+        self.errors = []
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def add_error(self, row_number, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row_number, 'error': message})
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            'rows': self.rows,
+            'books_created': self.books_created,
+            'authors_created': self.authors_created,
+            'errors': self.error_count,
+            'error_details': self.errors,
+            'seconds': round(self.elapsed, 3),
+            'rows_per_second': round(self.rows_per_second, 1),
+        }
+
+
+def _clean_row(row, current_year):
+    """Return (title, publication_year, author_name) or raise ValueError."""
+    if not isinstance(row, dict):
+        raise ValueError("Row is not an object.")
+    title = str(row.get('title') or '').strip()
+    author_name = str(row.get('author_name') or row.get('author') or '').strip()
+    if not title:
+        raise ValueError("title is required.")
+    if len(title) > Book._meta.get_field('title').max_length:
+        raise ValueError("title is too long.")
+    if not author_name:
+        raise ValueError("author_name is required.")
+    if len(author_name) > Author._meta.get_field('name').max_length:
+        raise ValueError("author_name is too long.")
+    try:
+        year = int(row.get('publication_year'))
+    except (TypeError, ValueError):
+        raise ValueError("publication_year must be an integer.")
+    if year > current_year:
+        raise ValueError("Publication year can not be in the future.")
+    return title, year, author_name
+
+
+def _resolve_authors(names, author_ids, report):
+    # One IN lookup for the names the map doesn't know yet, then one bulk insert
+    # for the names the database doesn't know either
+    missing = names - author_ids.keys()
+    if not missing:
+        return
+    if len(author_ids) + len(missing) > MAX_CACHED_AUTHORS:
+        author_ids.clear()
+        missing = names
+    for name, author_id in Author.objects.filter(name__in=missing).order_by('-id').values_list('name', 'id'):
+        author_ids[name] = author_id  # the oldest author of a duplicated name wins
+    new_authors = Author.objects.bulk_create(Author(name=name) for name in sorted(missing - author_ids.keys()))
+    author_ids.update((author.name, author.id) for author in new_authors)
+    report.authors_created += len(new_authors)
+
+
+def import_books(rows, chunk_size=IMPORT_CHUNK_SIZE, progress=None):
+    """Load books (and their missing authors) from an iterable of row dicts.
+
+    Invalid rows are skipped and reported; every chunk is written in its own
+    transaction. `progress` is called with the report after each chunk.
+    """
+    report = ImportReport()
+    current_year = date.today().year
+    author_ids = {}
+    rows = iter(rows)
+    while chunk := list(islice(rows, chunk_size)):
+        cleaned = []
+        for offset, row in enumerate(chunk, report.rows + 1):
+            try:
+                cleaned.append(_clean_row(row, current_year))
+            except ValueError as exc:
+                report.add_error(offset, str(exc))
+        report.rows += len(chunk)
+
+        with transaction.atomic():
+            _resolve_authors({author_name for _, _, author_name in cleaned}, author_ids, report)
+            Book.objects.bulk_create(
+                Book(title=title, publication_year=year, author_id=author_ids[author_name])
+                for title, year, author_name in cleaned
+            )
+        report.books_created += len(cleaned)
+        report.elapsed = time.perf_counter() - report.started
+        if progress:
+            progress(report)
+
+    report.elapsed = time.perf_counter() - report.started
+    return report
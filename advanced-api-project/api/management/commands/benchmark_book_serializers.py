@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from api.models import Author, Book
+from api.serializers import BookRowSerializer, BookSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rows/sec of the BookListView serialization paths on a throwaway test "
+        "database: BookSerializer without and with select_related('author'), and "
+        "BookRowSerializer over .values() rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--books', type=int, default=50000)
+        parser.add_argument('--authors', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=3, help="Runs per path; the best one is reported.")
+
+    def handle(self, *args, **options):
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.seed(options['books'], options['authors'])
+            paths = {
+                'ModelSerializer (no join)': lambda: BookSerializer(Book.objects.all(), many=True).data,
+                'ModelSerializer + select_related': lambda: BookSerializer(
+                    Book.objects.select_related('author'), many=True).data,
+                'BookRowSerializer + values()': lambda: BookRowSerializer(
+                    Book.objects.values(*BookRowSerializer.values_fields), many=True).data,
+            }
+            for name, serialize in paths.items():
+                best = None
+                for _ in range(options['repeat']):
+                    queries = []
+                    with connection.execute_wrapper(lambda execute, *args: queries.append(1) or execute(*args)):
+                        start = time.perf_counter()
+                        rows = len(serialize())
+                        elapsed = time.perf_counter() - start
+                    best = elapsed if best is None else min(best, elapsed)
+                self.stdout.write(
+                    f"{name:<34} {rows / best:>12,.0f} rows/sec  {best * 1000:>9.1f} ms  {len(queries):>6} queries"
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def seed(self, books, authors):
+        Author.objects.bulk_create(Author(name=f'Author {i}') for i in range(authors))
+        author_ids = list(Author.objects.values_list('id', flat=True))
+        Book.objects.bulk_create(
+            (Book(title=f'Book {i}', publication_year=1900 + i % 120, author_id=author_ids[i % len(author_ids)])
+             for i in range(books)),
+            batch_size=5000,
+        )
@@ -0,0 +1,41 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.importers import IMPORT_CHUNK_SIZE, IMPORT_FORMATS, ImportFormatError, detect_format, import_books, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Load books from a CSV, NDJSON or JSON array file (columns/keys: title, "
+        "publication_year, author_name). Authors are matched by name and created when missing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or - for stdin.")
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help="Defaults to the file extension, else csv.")
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or detect_format(path)
+        progress = self.report_progress if options['verbosity'] > 1 else None
+        try:
+            if path == '-':
+                report = import_books(read_rows(sys.stdin, fmt), options['chunk_size'], progress)
+            else:
+                with open(path, encoding='utf-8-sig', newline='') as stream:
+                    report = import_books(read_rows(stream, fmt), options['chunk_size'], progress)
+        except (OSError, ImportFormatError) as exc:
+            raise CommandError(f"Import stopped: {exc} Chunks before the error were committed.")
+
+        for error in report.errors:
+            self.stderr.write(f"row {error['row']}: {error['error']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report.books_created:,} books ({report.authors_created:,} new authors, "
+            f"{report.error_count:,} rows skipped) from {report.rows:,} rows in {report.elapsed:.1f}s "
+            f"- {report.rows_per_second:,.0f} rows/sec"
+        ))
+
+    def report_progress(self, report):
+        self.stdout.write(f"{report.rows:>12,} rows  {report.rows_per_second:>10,.0f} rows/sec")
@@ -0,0 +1,50 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from api.caching import bump_catalog_version
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database onto every replica in DATABASE_REPLICAS with "
+        "SQLite's online backup API. A local stand-in for replication: run it once, or "
+        "with --interval to keep the replicas trailing the primary."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, help="Seconds between copies; copy once when omitted.")
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError("No replicas configured; set API_READ_REPLICAS=1.")
+        primary = connections['default'].settings_dict['NAME']
+        for alias in settings.DATABASE_REPLICAS:
+            if connections[alias].vendor != 'sqlite' or connections[alias].settings_dict['NAME'] == primary:
+                raise CommandError(f"Replica {alias!r} must be a separate SQLite file.")
+
+        while True:
+            for alias in settings.DATABASE_REPLICAS:
+                start = time.perf_counter()
+                self.copy(primary, connections[alias])
+                self.stdout.write(f"{alias}: synced in {(time.perf_counter() - start) * 1000:.1f} ms")
+            # Responses cached from a replica that was behind are keyed by the catalog
+            # version of the write they missed; a new version retires them (this needs
+            # a cache shared with the server, LocMem entries just expire)
+            bump_catalog_version()
+            if options['interval'] is None:
+                break
+            time.sleep(options['interval'])
+
+    def copy(self, primary, replica):
+        replica.close()
+        source = sqlite3.connect(primary)
+        target = sqlite3.connect(replica.settings_dict['NAME'])
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
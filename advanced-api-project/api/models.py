@@ -1,16 +1,88 @@
 from django.db import models
+from django.db.models.functions import Lower
+from .caching import bump_catalog_version
 
-# Create your models here.
-class Author(models.Model):
-    name = models.CharField(max_length=100)
+# Every write path of the catalog bumps the catalog version, including the bulk
+# ones that skip save() and send no signals
+class CatalogQuerySet(models.QuerySet):
+
+    def bulk_create(self, objs, *args, **kwargs):
+        created = super().bulk_create(objs, *args, **kwargs)
+        bump_catalog_version()
+        return created
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        objs = list(objs)
+        for obj in objs:
+            obj.version += 1
+        fields = [*fields, 'version'] if 'version' not in fields else fields
+        rows = super().bulk_update(objs, fields, batch_size=batch_size)
+        bump_catalog_version()
+        return rows
+
+    def update(self, **kwargs):
+        kwargs.setdefault('version', models.F('version') + 1)
+        rows = super().update(**kwargs)
+        bump_catalog_version()
+        return rows
+
+    def delete(self):
+        deleted = super().delete()
+        bump_catalog_version()
+        return deleted
+    delete.queryset_only = True
+
+
+# Rows carry a version that goes up on every update; detail ETags are built from it
+class VersionedModel(models.Model):
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    objects = CatalogQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            self.version += 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'version'}
+        super().save(*args, **kwargs)
+        bump_catalog_version()
+
+    def delete(self, *args, **kwargs):
+        deleted = super().delete(*args, **kwargs)
+        bump_catalog_version()
+        return deleted
+
+
+class Author(VersionedModel):
+    name = models.CharField(max_length=100, db_index=True)
+
+    class Meta:
+        # ?author_name= matches case-insensitively on Lower(name)
+        indexes = [
+            models.Index(Lower('name'), name='author_name_lower_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
-class Book(models.Model):
+class Book(VersionedModel):
     title = models.CharField(max_length=100)
     publication_year = models.IntegerField()
     author = models.ForeignKey(Author, on_delete = models.CASCADE)
 
+    # One index per filter/order combination BookListView supports:
+    # ?ordering=title, ?publication_year=...&ordering=title (or just ?ordering=publication_year),
+    # ?author=...&ordering=publication_year, and the ?title= prefix on Lower(title)
+    class Meta:
+        indexes = [
+            models.Index(Lower('title'), name='book_title_lower_idx'),
+            models.Index(fields=['title'], name='book_title_idx'),
+            models.Index(fields=['publication_year', 'title'], name='book_year_title_idx'),
+            models.Index(fields=['author', 'publication_year'], name='book_author_year_idx'),
+        ]
+
     def __str__(self):
         return self.title
\ No newline at end of file
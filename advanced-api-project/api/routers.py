@@ -0,0 +1,91 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Cookie that keeps a client on the primary for a while after it wrote
+PIN_COOKIE = 'api_primary_pin'
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_pinned = ContextVar('api_primary_pinned', default=False)
+
+
+def is_pinned():
+    """Whether reads made now go to the primary."""
+    return _pinned.get()
+
+
+@contextmanager
+def pinned_to_primary():
+    """Send every read made inside the block to the primary."""
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Reads of the api models go to a random replica in settings.DATABASE_REPLICAS
+    unless the current request is pinned to the primary; everything else, and
+    every write, uses the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if replicas and model._meta.app_label == 'api':
+            return 'default' if _pinned.get() else random.choice(replicas)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Replicas get the schema from the primary with the data
+        return db not in settings.DATABASE_REPLICAS
+
+
+def _pinned_stream(content):
+    # Pins each step of the iteration, as the generator's own queries run in it
+    content = iter(content)
+    while True:
+        token = _pinned.set(True)
+        try:
+            chunk = next(content)
+        except StopIteration:
+            return
+        finally:
+            _pinned.reset(token)
+        yield chunk
+
+
+class ReplicaPinningMiddleware:
+    """
+    Pins writes, and every request for REPLICA_PIN_SECONDS after a successful
+    write, to the primary so clients always read their own writes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        writes = request.method not in SAFE_METHODS
+        pinned = writes or PIN_COOKIE in request.COOKIES
+        token = _pinned.set(pinned)
+        try:
+            response = self.get_response(request)
+        finally:
+            _pinned.reset(token)
+        if pinned and response.streaming:
+            # Streamed bodies run their queries after this returns
+            response.streaming_content = _pinned_stream(response.streaming_content)
+        if writes and response.status_code < 400 and settings.DATABASE_REPLICAS:
+            response.set_cookie(PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite='Lax')
+        return response
@@ -1,22 +1,137 @@
 from rest_framework import serializers
 from datetime import date
+from django.db import transaction
 from .models import Book, Author
 
+# Rows written per transaction by the bulk endpoints
+BULK_CHUNK_SIZE = 1000
+
 #implementation of the author class
 class AuthorSerializer(serializers.ModelSerializer):
     class Meta:
         model = Author
         fields = ['id', 'name']
 
+class AuthorBookSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Book
+        fields = ['id', 'title', 'publication_year']
+
+# Author with their books; the stats come from annotations made by the author views
+class AuthorDetailSerializer(serializers.ModelSerializer):
+    books = AuthorBookSerializer(source='book_set', many=True, read_only=True)
+    book_count = serializers.IntegerField(read_only=True)
+    first_publication_year = serializers.IntegerField(read_only=True)
+    last_publication_year = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Author
+        fields = ['id', 'name', 'book_count', 'first_publication_year', 'last_publication_year', 'books']
+
 class BookSerializer(serializers.ModelSerializer):
-    author = AuthorSerializer(many=True, read_only=True)
+    author = AuthorSerializer(read_only=True)
+    author_id = serializers.PrimaryKeyRelatedField(source='author', queryset=Author.objects.all(), write_only=True)
 
     class Meta:
         model = Book
-        fields = ['id', 'title', 'publication_year', 'author']
+        fields = ['id', 'title', 'publication_year', 'author', 'author_id']
     # validation to ensure publication year is not the future
-    def validate(self, data):
-        current_year = date.today().year
-        if data['publication_year'] > current_year:
+    def validate_publication_year(self, value):
+        if value > date.today().year:
             raise serializers.ValidationError("Publication year can not be in the future.")
-        return data
\ No newline at end of file
+        return value
+
+
+def _chunks(items, size=BULK_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+# Bulk create/update: items are validated field by field as usual, but the checks
+# that need the whole batch (future years, existing authors and books) run once per
+# request here instead of once per item, and writes go through bulk_create/bulk_update.
+class BookBulkListSerializer(serializers.ListSerializer):
+
+    def to_internal_value(self, data):
+        attrs = super().to_internal_value(data)
+        current_year = date.today().year
+        errors = [{} for _ in attrs]
+        author_ids = {item['author_id'] for item in attrs if 'author_id' in item}
+        known_authors = set(Author.objects.filter(id__in=author_ids).values_list('id', flat=True))
+        for error, item in zip(errors, attrs):
+            if item.get('publication_year', 0) > current_year:
+                error['publication_year'] = ["Publication year can not be in the future."]
+            if 'author_id' in item and item['author_id'] not in known_authors:
+                error['author_id'] = [f"Invalid pk \"{item['author_id']}\" - object does not exist."]
+
+        if self.instance is not None:
+            ids = [item.get('id') for item in attrs]
+            known_books = set(self.instance.filter(id__in=ids).values_list('id', flat=True))
+            for error, book_id in zip(errors, ids):
+                if book_id is None:
+                    error['id'] = ["This field is required."]
+                elif book_id not in known_books:
+                    error['id'] = [f"Invalid pk \"{book_id}\" - object does not exist."]
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    def create(self, validated_data):
+        books = [Book(**item) for item in validated_data]
+        for chunk in _chunks(books):
+            with transaction.atomic():
+                Book.objects.bulk_create(chunk)
+        return books
+
+    def update(self, instance, validated_data):
+        # Partial update keyed by id: each chunk loads its books once and writes
+        # only the fields the payload sent
+        books = []
+        for chunk in _chunks(validated_data):
+            with transaction.atomic():
+                existing = instance.in_bulk([item['id'] for item in chunk])
+                fields = set()
+                for item in chunk:
+                    book = existing[item['id']]
+                    for field, value in item.items():
+                        setattr(book, field, value)
+                    fields.update(item)
+                fields.discard('id')
+                if fields:
+                    Book.objects.bulk_update(existing.values(), sorted(fields))
+                books.extend(existing[item['id']] for item in chunk)
+        return books
+
+
+class BookBulkSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)
+    author_id = serializers.IntegerField()
+
+    class Meta:
+        model = Book
+        fields = ['id', 'title', 'publication_year', 'author_id']
+        list_serializer_class = BookBulkListSerializer
+
+    def validate_id(self, value):
+        if self.parent.instance is None:
+            raise serializers.ValidationError("Ids are assigned by the server.")
+        return value
+
+
+class BookBulkDeleteSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+
+
+# Read-only fast path for listing books: builds the same payload as BookSerializer
+# straight from `.values()` rows, without model instances or per-field objects.
+class BookRowSerializer(serializers.BaseSerializer):
+    values_fields = ('id', 'title', 'publication_year', 'author_id', 'author__name')
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'title': row['title'],
+            'publication_year': row['publication_year'],
+            'author': {'id': row['author_id'], 'name': row['author__name']},
+        }
@@ -0,0 +1,159 @@
+import json
+import os
+import time
+from collections import defaultdict
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .models import Author, Book
+
+# Catalog sizes every endpoint is measured at; a query count that differs between
+# them means some query runs per row
+CATALOG_SIZES = (1, 20, 60)
+
+# Set QUERY_BUDGET_REPORT to a file path to get the timings as JSON
+TIMINGS = defaultdict(dict)
+
+
+def tearDownModule():
+    path = os.environ.get('QUERY_BUDGET_REPORT')
+    if path:
+        with open(path, 'w') as handle:
+            json.dump(TIMINGS, handle, indent=2, sort_keys=True)
+
+
+class QueryBudgetMixin:
+    """
+    assertQueryBudget() runs a request against catalogs of every size in
+    CATALOG_SIZES and fails when its query count depends on the size or goes
+    over `max_queries`. Responses are never served from the cache here.
+    """
+
+    def seed(self, size):
+        missing = size - Book.objects.count()
+        if missing > 0:
+            authors = Author.objects.bulk_create(Author(name=f'Author {i}') for i in range(missing // 3 + 1))
+            Book.objects.bulk_create(
+                Book(title=f'Book {i}', publication_year=1900 + i % 100, author=authors[i % len(authors)])
+                for i in range(missing)
+            )
+
+    def measure(self, request):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = request()
+            if response.streaming:
+                b''.join(response.streaming_content)
+            elapsed = (time.perf_counter() - start) * 1000
+        self.assertLess(response.status_code, 400, getattr(response, 'data', None))
+        return len(queries), elapsed
+
+    def assertQueryBudget(self, name, request, max_queries, prepare=None, sizes=CATALOG_SIZES):
+        # request is called with prepare(size), or the size itself; prepare's own
+        # queries (looking up ids to request) are not counted
+        counts = {}
+        for size in sizes:
+            with self.subTest(endpoint=name, books=size):
+                self.seed(size)
+                arg = prepare(size) if prepare else size
+                counts[size], TIMINGS[name][size] = self.measure(lambda: request(arg))
+                self.assertLessEqual(counts[size], max_queries, f'{name} with {size} books')
+        self.assertEqual(len(set(counts.values())), 1,
+                         f'{name}: query count grows with the number of books {counts}')
+
+
+class EndpointQueryBudgetTestCase(QueryBudgetMixin, TestCase):
+    """
+    Query budgets of every api endpoint, measured at several catalog sizes.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_user(username='budget', password='testpass123'))
+
+    def last_book(self, size):
+        return Book.objects.last().pk
+
+    def test_book_list(self):
+        """
+        Test the list with the filter, search and ordering parameters it supports.
+        """
+        for name, params in [
+            ('book-list', {}),
+            ('book-list?filter', {'publication_year__gte': 1900, 'author_name': 'author 1'}),
+            ('book-list?search', {'search': 'Book'}),
+            ('book-list?ordering', {'ordering': '-title'}),
+        ]:
+            self.assertQueryBudget(name, lambda size: self.client.get(reverse('book-list'), params), 2)
+        self.assertQueryBudget('book-list?facets', lambda size: self.client.get(
+            reverse('book-list'), {'facets': 'decade,author'}
+        ), 4)
+
+    def test_book_detail(self):
+        self.assertQueryBudget(
+            'book-detail', lambda pk: self.client.get(reverse('book-detail', args=[pk])), 2, self.last_book
+        )
+
+    def test_book_export(self):
+        for fmt in ('csv', 'ndjson'):
+            self.assertQueryBudget(
+                f'book-export-{fmt}', lambda size: self.client.get(reverse('book-export', args=[fmt])), 1
+            )
+
+    def test_author_list_and_detail(self):
+        self.assertQueryBudget('author-list', lambda size: self.client.get(reverse('author-list')), 3)
+        self.assertQueryBudget(
+            'author-detail', lambda pk: self.client.get(reverse('author-detail', args=[pk])), 2,
+            lambda size: Author.objects.first().pk,
+        )
+
+    def test_book_writes(self):
+        """
+        Test the single-book create, update and delete views.
+        """
+        self.assertQueryBudget('book-create', lambda author_id: self.client.post(
+            reverse('book-create'), {'title': 'New', 'publication_year': 2000, 'author_id': author_id}, format='json'
+        ), 2, lambda size: Author.objects.first().pk)
+        self.assertQueryBudget('book-update', lambda pk: self.client.patch(
+            reverse('book-update', args=[pk]), {'title': 'Changed'}, format='json'
+        ), 3, self.last_book)
+        self.assertQueryBudget('book-delete', lambda pk: self.client.delete(
+            reverse('book-delete', args=[pk])
+        ), 2, self.last_book)
+
+
+class BatchQueryBudgetTestCase(QueryBudgetMixin, TestCase):
+    """
+    Query budgets of the batch endpoints, measured at several batch sizes.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_user(username='budget', password='testpass123'))
+        self.author = Author.objects.create(name='Batch Author')
+
+    def test_bulk_create_update_delete(self):
+        self.assertQueryBudget('book-bulk-create', lambda size: self.client.post(reverse('book-bulk'), [
+            {'title': f'Bulk {i}', 'publication_year': 2000, 'author_id': self.author.pk} for i in range(size)
+        ], format='json'), 4)
+        book_ids = lambda size: list(Book.objects.values_list('pk', flat=True)[:size])
+        self.assertQueryBudget('book-bulk-update', lambda ids: self.client.patch(reverse('book-bulk'), [
+            {'id': pk, 'title': 'Renamed'} for pk in ids
+        ], format='json'), 6, book_ids)
+        self.assertQueryBudget('book-bulk-delete', lambda ids: self.client.delete(
+            reverse('book-bulk'), {'ids': ids}, format='json'
+        ), 1, book_ids)
+
+    def test_import(self):
+        rows = lambda size: ''.join(f'Imported {i},1990,Author {i % 7}\n' for i in range(size))
+        self.assertQueryBudget('book-import', lambda size: self.client.post(reverse('book-import'), {
+            'file': SimpleUploadedFile('books.csv', f'title,publication_year,author_name\n{rows(size)}'.encode())
+        }, format='multipart'), 5)
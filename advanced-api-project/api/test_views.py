@@ -200,7 +200,7 @@ class BookAPITestCase(TestCase):
         """
         response = self.client.get(self.list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 3)
+        self.assertEqual(len(response.data['results']), 3)
     
     def test_book_list_authenticated(self):
         """
@@ -209,7 +209,7 @@ class BookAPITestCase(TestCase):
         self.client.force_authenticate(user=self.user)
         response = self.client.get(self.list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 3)
+        self.assertEqual(len(response.data['results']), 3)
     
     def test_book_list_with_login(self):
         """
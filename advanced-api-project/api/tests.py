@@ -4,7 +4,21 @@ from rest_framework.test import APIClient
 from rest_framework import status
 from django.contrib.auth.models import User
 from .models import Book, Author
+from .checks import check_filter_indexes, check_shared_cache, has_supporting_index
+from .filters import BookFilter
 from datetime import date
+import io
+import json
+import os
+import tempfile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, override_settings
+from .routers import PIN_COOKIE, PrimaryReplicaRouter, ReplicaPinningMiddleware, pinned_to_primary
+from .caching import cached_response
+from . import importers
 
 
 class BookAPITestCase(TestCase):
@@ -78,7 +92,7 @@ class BookAPITestCase(TestCase):
         """
         response = self.client.get(self.list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 3)  # Should return all 3 books
+        self.assertEqual(len(response.data['results']), 3)  # Should return all 3 books
     
     def test_book_list_authenticated(self):
         """
@@ -87,7 +101,7 @@ class BookAPITestCase(TestCase):
         self.client.force_authenticate(user=self.user)
         response = self.client.get(self.list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 3)
+        self.assertEqual(len(response.data['results']), 3)
     
     def test_book_list_response_structure(self):
         """
@@ -97,7 +111,7 @@ class BookAPITestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         
         # Check first book structure
-        book_data = response.data[0]
+        book_data = response.data['results'][0]
         self.assertIn('id', book_data)
         self.assertIn('title', book_data)
         self.assertIn('publication_year', book_data)
@@ -108,6 +122,22 @@ class BookAPITestCase(TestCase):
         self.assertIn('name', book_data['author'])
 
 
+    def test_book_list_paginated_with_author_join(self):
+        """
+        Test that the list is paginated and authors come from the same query.
+        """
+        self.client.force_authenticate(user=self.user)
+        with self.assertNumQueries(2):  # count + page
+            response = self.client.get(self.list_url)
+        self.assertEqual(response.data['count'], 3)
+        self.assertIsNone(response.data['next'])
+        self.assertEqual(
+            response.data['results'][0],
+            {'id': self.book1.id, 'title': 'Harry Potter', 'publication_year': 1997,
+             'author': {'id': self.author1.id, 'name': 'J.K. Rowling'}},
+        )
+
+
     # ==================== DETAIL VIEW TESTS ====================
     
     def test_book_detail_success(self):
@@ -281,8 +311,8 @@ class BookAPITestCase(TestCase):
         """
         response = self.client.get(self.list_url, {'publication_year': 1949})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['title'], '1984')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['title'], '1984')
     
     def test_filter_by_author(self):
         """
@@ -290,8 +320,8 @@ class BookAPITestCase(TestCase):
         """
         response = self.client.get(self.list_url, {'author': self.author2.id})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['author']['name'], 'George Orwell')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['author']['name'], 'George Orwell')
 
 
     # ==================== SEARCHING TESTS ====================
@@ -302,8 +332,8 @@ class BookAPITestCase(TestCase):
         """
         response = self.client.get(self.list_url, {'search': 'Harry'})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertGreater(len(response.data), 0)
-        self.assertIn('Harry', response.data[0]['title'])
+        self.assertGreater(len(response.data['results']), 0)
+        self.assertIn('Harry', response.data['results'][0]['title'])
     
     def test_search_by_author_name(self):
         """
@@ -311,8 +341,8 @@ class BookAPITestCase(TestCase):
         """
         response = self.client.get(self.list_url, {'search': 'Orwell'})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['author']['name'], 'George Orwell')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['author']['name'], 'George Orwell')
     
     def test_search_no_results(self):
         """
@@ -320,7 +350,25 @@ class BookAPITestCase(TestCase):
         """
         response = self.client.get(self.list_url, {'search': 'NonexistentBook'})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 0)
+        self.assertEqual(len(response.data['results']), 0)
+
+
+    def test_search_by_year_is_exact(self):
+        """
+        Test that numeric search terms match the publication year exactly.
+        """
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.list_url, {'search': '1949'})
+        self.assertEqual([book['title'] for book in response.data['results']], ['1984'])
+        response = self.client.get(self.list_url, {'search': '194'})
+        self.assertEqual(response.data['results'], [])
+
+    def test_filter_by_author_name_and_year_range(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.list_url, {'author_name': 'jane austen'})
+        self.assertEqual([book['title'] for book in response.data['results']], ['Pride and Prejudice'])
+        response = self.client.get(self.list_url, {'publication_year__gte': 1900, 'ordering': 'publication_year'})
+        self.assertEqual([book['title'] for book in response.data['results']], ['1984', 'Harry Potter'])
 
 
     # ==================== ORDERING TESTS ====================
@@ -331,7 +379,7 @@ class BookAPITestCase(TestCase):
         """
         response = self.client.get(self.list_url, {'ordering': 'title'})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        titles = [book['title'] for book in response.data]
+        titles = [book['title'] for book in response.data['results']]
         self.assertEqual(titles, sorted(titles))
     
     def test_ordering_by_title_descending(self):
@@ -340,7 +388,7 @@ class BookAPITestCase(TestCase):
         """
         response = self.client.get(self.list_url, {'ordering': '-title'})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        titles = [book['title'] for book in response.data]
+        titles = [book['title'] for book in response.data['results']]
         self.assertEqual(titles, sorted(titles, reverse=True))
     
     def test_ordering_by_publication_year(self):
@@ -349,7 +397,7 @@ class BookAPITestCase(TestCase):
         """
         response = self.client.get(self.list_url, {'ordering': 'publication_year'})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        years = [book['publication_year'] for book in response.data]
+        years = [book['publication_year'] for book in response.data['results']]
         self.assertEqual(years, sorted(years))
 
 
@@ -374,13 +422,401 @@ class BookAPITestCase(TestCase):
             }
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertGreater(len(response.data), 0)
+        self.assertGreater(len(response.data['results']), 0)
         
         # Verify results are ordered
-        years = [book['publication_year'] for book in response.data]
+        years = [book['publication_year'] for book in response.data['results']]
         self.assertEqual(years, sorted(years))
 
 
+class BookBulkAPITestCase(TestCase):
+    """
+    Test suite for the bulk create/update/delete endpoint.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='syncer', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        self.author = Author.objects.create(name='Terry Pratchett')
+        self.url = reverse('book-bulk')
+
+    def test_bulk_create(self):
+        """
+        Test that a list of books is created with a constant number of queries.
+        """
+        data = [{'title': f'Discworld {i}', 'publication_year': 1950 + i, 'author_id': self.author.id}
+                for i in range(50)]
+        with self.assertNumQueries(4):  # author check + savepoint + insert + release
+            response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Book.objects.count(), 50)
+        self.assertTrue(all(book['id'] for book in response.data))
+
+    def test_bulk_create_validates_whole_batch(self):
+        future_year = date.today().year + 1
+        data = [
+            {'title': 'Good', 'publication_year': 1990, 'author_id': self.author.id},
+            {'title': 'Future', 'publication_year': future_year, 'author_id': self.author.id},
+            {'title': 'Orphan', 'publication_year': 1990, 'author_id': 9999},
+        ]
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('publication_year', response.data[1])
+        self.assertIn('author_id', response.data[2])
+        self.assertEqual(Book.objects.count(), 0)
+
+    def test_bulk_partial_update(self):
+        books = Book.objects.bulk_create(
+            Book(title=f'Book {i}', publication_year=2000, author=self.author) for i in range(3)
+        )
+        data = [{'id': books[0].id, 'title': 'Renamed'}, {'id': books[2].id, 'publication_year': 2001}]
+        response = self.client.patch(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Book.objects.get(id=books[0].id).title, 'Renamed')
+        self.assertEqual(Book.objects.get(id=books[2].id).publication_year, 2001)
+        self.assertEqual(Book.objects.get(id=books[1].id).title, 'Book 1')
+
+        response = self.client.patch(self.url, [{'id': 9999, 'title': 'Missing'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('id', response.data[0])
+
+    def test_bulk_delete(self):
+        books = Book.objects.bulk_create(
+            Book(title=f'Book {i}', publication_year=2000, author=self.author) for i in range(5)
+        )
+        response = self.client.delete(self.url, {'ids': [books[0].id, books[1].id, 9999]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['deleted'], 2)
+        self.assertEqual(Book.objects.count(), 3)
+
+    def test_bulk_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.post(self.url, [], format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class BookExportTestCase(TestCase):
+    """
+    Test suite for the streaming CSV/NDJSON export.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='exporter', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        orwell = Author.objects.create(name='George Orwell')
+        austen = Author.objects.create(name='Jane Austen')
+        self.books = [
+            Book.objects.create(title='1984', publication_year=1949, author=orwell),
+            Book.objects.create(title='Animal Farm', publication_year=1945, author=orwell),
+            Book.objects.create(title='Emma', publication_year=1815, author=austen),
+        ]
+
+    def _content(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_export(self):
+        """
+        Test that the CSV export has a header and one line per book, in id order.
+        """
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('book-export', args=['csv']), HTTP_ACCEPT='text/csv')
+            lines = self._content(response).splitlines()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        self.assertEqual(lines[0], 'id,title,publication_year,author_id,author_name')
+        self.assertEqual(lines[1], f'{self.books[0].id},1984,1949,{self.books[0].author_id},George Orwell')
+        self.assertEqual(len(lines), 4)
+
+    def test_ndjson_export_honors_filters(self):
+        """
+        Test that the export accepts the same filter and ordering parameters as the list.
+        """
+        response = self.client.get(
+            reverse('book-export', args=['ndjson']),
+            {'author_name': 'george orwell', 'ordering': 'publication_year'},
+        )
+        rows = [json.loads(line) for line in self._content(response).splitlines()]
+        self.assertEqual([row['title'] for row in rows], ['Animal Farm', '1984'])
+        self.assertEqual(rows[0]['author_name'], 'George Orwell')
+
+    def test_unknown_format_not_found(self):
+        response = self.client.get(reverse('book-export', args=['xml']))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class BookImportTestCase(TestCase):
+    """
+    Test suite for the streaming book importer, its command and upload endpoint.
+    """
+
+    def setUp(self):
+        self.orwell = Author.objects.create(name='George Orwell')
+
+    def test_json_array_reader_handles_split_elements(self):
+        """
+        Test that array elements cut across reads are decoded once complete.
+        """
+        text = '[{"title": "1984", "publication_year": 1949}, {"title": "Emma"} ]'
+        rows = list(importers._read_json_array(io.StringIO(text), read_size=7))
+        self.assertEqual(rows, [{'title': '1984', 'publication_year': 1949}, {'title': 'Emma'}])
+        with self.assertRaises(importers.ImportFormatError):
+            list(importers._read_json_array(io.StringIO('[{"title": 1'), read_size=4))
+
+    def test_import_deduplicates_authors(self):
+        """
+        Test that authors are resolved with one lookup per chunk and created once.
+        """
+        rows = [
+            {'title': 'Animal Farm', 'publication_year': '1945', 'author_name': 'George Orwell'},
+            {'title': 'Emma', 'publication_year': '1815', 'author_name': 'Jane Austen'},
+            {'title': 'Persuasion', 'publication_year': '1817', 'author_name': 'Jane Austen'},
+            {'title': 'Future', 'publication_year': str(date.today().year + 1), 'author_name': 'Jane Austen'},
+            {'title': 'Mansfield Park', 'publication_year': '1814', 'author_name': 'Jane Austen'},
+        ]
+        # the first chunk looks up and creates authors, the second only inserts books
+        with self.assertNumQueries(8):
+            report = importers.import_books(rows, chunk_size=3)
+        self.assertEqual((report.rows, report.books_created, report.authors_created), (5, 4, 1))
+        self.assertEqual(report.errors, [{'row': 4, 'error': 'Publication year can not be in the future.'}])
+        self.assertEqual(Author.objects.filter(name='Jane Austen').get().book_set.count(), 3)
+        self.assertEqual(self.orwell.book_set.get().title, 'Animal Farm')
+
+    def test_import_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.ndjson', delete=False) as handle:
+            handle.write('{"title": "1984", "publication_year": 1949, "author_name": "George Orwell"}\n')
+        self.addCleanup(os.remove, handle.name)
+        out = io.StringIO()
+        call_command('import_books', handle.name, stdout=out)
+        self.assertIn('Imported 1 books', out.getvalue())
+        self.assertEqual(self.orwell.book_set.count(), 1)
+
+    def test_upload_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(user=User.objects.create_user(username='loader', password='testpass123'))
+        upload = SimpleUploadedFile(
+            'books.csv', b'title,publication_year,author_name\n1984,1949,George Orwell\nEmma,1815,Jane Austen\n'
+        )
+        response = client.post(reverse('book-import'), {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['books_created'], 2)
+        self.assertEqual(response.data['authors_created'], 1)
+
+        upload = SimpleUploadedFile('books.txt', b'{"title": "Emma"')
+        response = client.post(reverse('book-import'), {'file': upload, 'format': 'json'}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BookHTTPCachingTestCase(TestCase):
+    """
+    Test suite for ETags and the response cache of the book list and detail views.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_user(username='reader', password='testpass123'))
+        self.author = Author.objects.create(name='George Orwell')
+        self.book = Book.objects.create(title='1984', publication_year=1949, author=self.author)
+
+    def test_list_is_cached_per_catalog_version(self):
+        """
+        Test that a repeated list is served without queries and a write invalidates it.
+        """
+        url = reverse('book-list')
+        response = self.client.get(url, {'ordering': 'title', 'search': ''})
+        etag = response['ETag']
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url, {'ordering': 'title'}).data, response.data)
+            response = self.client.get(url, {'ordering': 'title'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.author.name = 'Eric Blair'
+        self.author.save()
+        response = self.client.get(url, {'ordering': 'title'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['author']['name'], 'Eric Blair')
+
+    def test_bulk_writes_invalidate_list(self):
+        etag = self.client.get(reverse('book-list'))['ETag']
+        Book.objects.filter(pk=self.book.pk).update(title='Nineteen Eighty-Four')
+        self.assertNotEqual(self.client.get(reverse('book-list'))['ETag'], etag)
+        self.assertEqual(Book.objects.get(pk=self.book.pk).version, 2)
+
+    def test_detail_etag_follows_row_version(self):
+        """
+        Test that the detail ETag only changes with the book or its author.
+        """
+        url = reverse('book-detail', args=[self.book.pk])
+        etag = self.client.get(url)['ETag']
+        Book.objects.create(title='Animal Farm', publication_year=1945, author=self.author)
+        with self.assertNumQueries(1):  # version lookup
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.book.title = 'Nineteen Eighty-Four'
+        self.book.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['title'], 'Nineteen Eighty-Four')
+        self.assertEqual(self.client.get(reverse('book-detail', args=[9999])).status_code, 404)
+
+
+class AuthorEndpointTestCase(TestCase):
+    """
+    Test suite for the author list/detail endpoints and their stats.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.orwell = Author.objects.create(name='George Orwell')
+        self.austen = Author.objects.create(name='Jane Austen')
+        Author.objects.create(name='Unpublished')
+        Book.objects.bulk_create([
+            Book(title='1984', publication_year=1949, author=self.orwell),
+            Book(title='Animal Farm', publication_year=1945, author=self.orwell),
+            Book(title='Emma', publication_year=1815, author=self.austen),
+        ])
+
+    def test_author_list_with_books_and_stats(self):
+        """
+        Test that a page of authors takes a fixed number of queries, then none once cached.
+        """
+        with self.assertNumQueries(3):  # count + authors with stats + books
+            response = self.client.get(reverse('author-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        orwell = response.data['results'][0]
+        self.assertEqual(orwell['name'], 'George Orwell')
+        self.assertEqual(orwell['book_count'], 2)
+        self.assertEqual((orwell['first_publication_year'], orwell['last_publication_year']), (1945, 1949))
+        self.assertEqual([book['title'] for book in orwell['books']], ['Animal Farm', '1984'])
+        self.assertEqual(response.data['results'][2]['book_count'], 0)
+
+        with self.assertNumQueries(0):
+            self.client.get(reverse('author-list'))
+
+    def test_author_list_ordering_by_book_count(self):
+        response = self.client.get(reverse('author-list'), {'ordering': '-book_count'})
+        self.assertEqual([a['name'] for a in response.data['results']],
+                         ['George Orwell', 'Jane Austen', 'Unpublished'])
+
+    def test_author_detail_follows_new_books(self):
+        url = reverse('author-detail', args=[self.austen.pk])
+        self.assertEqual(self.client.get(url).data['book_count'], 1)
+        Book.objects.create(title='Persuasion', publication_year=1817, author=self.austen)
+        response = self.client.get(url)
+        self.assertEqual(response.data['book_count'], 2)
+        self.assertEqual(response.data['last_publication_year'], 1817)
+        self.assertEqual(self.client.get(reverse('author-detail', args=[9999])).status_code, 404)
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTestCase(TestCase):
+    """
+    Tests for the primary/replica router and the read-your-writes pinning.
+    """
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+
+    def test_routing(self):
+        self.assertEqual(self.router.db_for_read(Book), 'replica')
+        self.assertIsNone(self.router.db_for_read(User))
+        self.assertEqual(self.router.db_for_write(Book), 'default')
+        with pinned_to_primary():
+            self.assertEqual(self.router.db_for_read(Book), 'default')
+        self.assertFalse(self.router.allow_migrate('replica', 'api'))
+
+    def test_writes_pin_the_client(self):
+        """
+        Test that a write is pinned and sets the cookie that pins the next reads.
+        """
+        seen = []
+        middleware = ReplicaPinningMiddleware(
+            lambda request: seen.append(self.router.db_for_read(Book)) or HttpResponse()
+        )
+        factory = RequestFactory()
+        response = middleware(factory.post('/api/books/create/'))
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+        middleware(factory.get('/api/books/'))
+        pinned_read = factory.get('/api/books/')
+        pinned_read.COOKIES[PIN_COOKIE] = '1'
+        middleware(pinned_read)
+        self.assertEqual(seen, ['default', 'replica', 'default'])
+
+    def test_pinned_stream_reads_primary(self):
+        """
+        Test that a streamed body still reads from the primary after the view returned.
+        """
+        def stream():
+            yield self.router.db_for_read(Book)
+
+        middleware = ReplicaPinningMiddleware(lambda request: StreamingHttpResponse(stream()))
+        request = RequestFactory().get('/api/books/export/csv/')
+        request.COOKIES[PIN_COOKIE] = '1'
+        self.assertEqual(list(middleware(request).streaming_content), [b'default'])
+        unpinned = middleware(RequestFactory().get('/api/books/export/csv/'))
+        self.assertEqual(list(unpinned.streaming_content), [b'replica'])
+
+    def test_pinned_requests_skip_response_cache(self):
+        cache.clear()
+        builds = []
+        request = RequestFactory().get('/api/books/')
+        cached_response(request, 'books-1', lambda: builds.append('replica') or {'source': 'replica'})
+        self.assertEqual(cached_response(request, 'books-1', lambda: {}).data, {'source': 'replica'})
+        with pinned_to_primary():
+            response = cached_response(request, 'books-1', lambda: {'source': 'primary'})
+        self.assertEqual(response.data, {'source': 'primary'})
+        self.assertEqual(builds, ['replica'])
+
+
+class BookFacetTestCase(TestCase):
+    """
+    Test suite for the decade and author facets of the book list.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_user(username='browser', password='testpass123'))
+        self.orwell = Author.objects.create(name='George Orwell')
+        self.austen = Author.objects.create(name='Jane Austen')
+        Book.objects.bulk_create([
+            Book(title='1984', publication_year=1949, author=self.orwell),
+            Book(title='Animal Farm', publication_year=1945, author=self.orwell),
+            Book(title='Burmese Days', publication_year=1934, author=self.orwell),
+            Book(title='Emma', publication_year=1815, author=self.austen),
+        ])
+
+    def test_facets_follow_filters(self):
+        """
+        Test that facets count the filtered books with one query per facet.
+        """
+        with self.assertNumQueries(4):  # count + page + one per facet
+            response = self.client.get(reverse('book-list'), {'facets': 'decade,author', 'publication_year__gte': 1900})
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(response.data['facets']['decade'],
+                         [{'value': 1930, 'count': 1}, {'value': 1940, 'count': 2}])
+        self.assertEqual(response.data['facets']['author'],
+                         [{'value': self.orwell.pk, 'name': 'George Orwell', 'count': 3}])
+
+    def test_facets_cached_across_pages_and_ordering(self):
+        self.client.get(reverse('book-list'), {'facets': 'author'})
+        with self.assertNumQueries(2):  # count + page, facets come from the cache
+            response = self.client.get(reverse('book-list'), {'facets': 'author', 'ordering': '-title'})
+        self.assertEqual(response.data['facets']['author'][0]['count'], 3)
+
+    def test_unknown_facet_rejected(self):
+        response = self.client.get(reverse('book-list'), {'facets': 'genre'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotIn('facets', self.client.get(reverse('book-list')).data)
+
+
 # ==================== ADDITIONAL TEST CASES ====================
 
 class AuthorAPITestCase(TestCase):
@@ -399,6 +835,56 @@ class AuthorAPITestCase(TestCase):
         self.assertEqual(str(self.author), 'Test Author')
 
 
+class FilterIndexCheckTestCase(TestCase):
+    """
+    Test cases for the system check that filter/order fields are indexed.
+    """
+
+    def test_book_list_filters_are_indexed(self):
+        self.assertEqual(check_filter_indexes(None), [])
+
+    def test_has_supporting_index(self):
+        self.assertTrue(has_supporting_index(Book, 'publication_year'))
+        self.assertTrue(has_supporting_index(Book, 'author__name'))
+        self.assertFalse(has_supporting_index(User, 'first_name'))
+
+    def test_per_process_cache_warned_in_production(self):
+        with self.settings(DEBUG=True):
+            self.assertEqual(check_shared_cache(None), [])
+        with self.settings(DEBUG=False):
+            self.assertEqual([warning.id for warning in check_shared_cache(None)], ['api.W003'])
+            redis = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache'}}
+            with self.settings(CACHES=redis):
+                self.assertEqual(check_shared_cache(None), [])
+
+    def test_unindexable_lookups_rejected(self):
+        self.assertFalse(has_supporting_index(Book, 'title', 'icontains'))
+        self.assertFalse(has_supporting_index(Book, 'author__name', 'iexact'))
+        self.assertFalse(has_supporting_index(Book, 'title', 'contains'))
+        self.assertTrue(has_supporting_index(Book, 'title', 'startswith', lower=True))
+        self.assertTrue(has_supporting_index(Book, 'author__name', lower=True))
+        self.assertFalse(has_supporting_index(Book, 'publication_year', lower=True))
+
+    def test_title_prefix_uses_lower_index(self):
+        author = Author.objects.create(name='Jane Austen')
+        Book.objects.create(title='Emma', publication_year=1815, author=author)
+        Book.objects.create(title='Pride and Prejudice', publication_year=1813, author=author)
+        queryset = BookFilter({'title': 'em'}, queryset=Book.objects.all()).qs
+        self.assertEqual([book.title for book in queryset], ['Emma'])
+        self.assertIn('book_title_lower_idx', queryset.explain())
+
+    def test_lower_filters_match_non_ascii(self):
+        zola = Author.objects.create(name='Émile Zola')
+        Book.objects.create(title='Éclair', publication_year=1880, author=zola)
+        Book.objects.create(title='Germinal', publication_year=1885, author=zola)
+        for params in ({'author_name': 'Émile Zola'}, {'author_name': 'ÉMILE ZOLA'},
+                       {'title': 'Éclair'}, {'title': 'Écl'}, {'title': 'ÉCLA'}, {'title': 'germ'}):
+            queryset = BookFilter(params, queryset=Book.objects.all()).qs
+            self.assertTrue(queryset.exists(), params)
+        self.assertEqual([book.title for book in BookFilter({'title': 'ÉclZ'}, queryset=Book.objects.all()).qs], [])
+        self.assertEqual(BookFilter({'title': 'Z'}, queryset=Book.objects.all()).qs.count(), 0)
+
+
 class BookModelTestCase(TestCase):
     """
     Test cases for Book model methods and properties.
@@ -1,10 +1,15 @@
 from django.urls import path
-from .views import BookListView, BookDetailView, BookCreateView, BookUpdateView, BookDeleteView
+from .views import BookListView, BookDetailView, BookCreateView, BookUpdateView, BookDeleteView, BookBulkView, BookExportView, BookImportView, AuthorListView, AuthorDetailView
 
 urlpatterns = [
     path('books/', BookListView.as_view(), name='book-list'),
-    path('books/<int:pk>/', BookDetailView.as_view(), name='book_detail'),
-    path('books/create/', BookCreateView.as_view(), name='book_create'),
-    path('books/update/', BookUpdateView.as_view(), name='book_update'),
-    path('books/delete/', BookDeleteView.as_view(), name='book_delete')
-]
\ No newline at end of file
+    path('books/<int:pk>/', BookDetailView.as_view(), name='book-detail'),
+    path('books/create/', BookCreateView.as_view(), name='book-create'),
+    path('books/<int:pk>/update/', BookUpdateView.as_view(), name='book-update'),
+    path('books/<int:pk>/delete/', BookDeleteView.as_view(), name='book-delete'),
+    path('books/export/<str:fmt>/', BookExportView.as_view(), name='book-export'),
+    path('books/import/', BookImportView.as_view(), name='book-import'),
+    path('books/bulk/', BookBulkView.as_view(), name='book-bulk'),
+    path('authors/', AuthorListView.as_view(), name='author-list'),
+    path('authors/<int:pk>/', AuthorDetailView.as_view(), name='author-detail'),
+]
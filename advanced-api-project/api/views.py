@@ -1,36 +1,202 @@
+from django.http import Http404, StreamingHttpResponse
+from django.db.models import Count, Max, Min, Prefetch
 from django.shortcuts import render
-from rest_framework import generics
+from rest_framework import generics, status
+from rest_framework.response import Response
 from .models import Book, Author
-from .serializers import BookSerializer, AuthorSerializer
+from .serializers import (
+    BookSerializer, AuthorSerializer, AuthorDetailSerializer, BookRowSerializer,
+    BookBulkSerializer, BookBulkDeleteSerializer, BULK_CHUNK_SIZE,
+)
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
 from django_filters import rest_framework
-from .filters import BookFilter
+from .filters import BookFilter, BookSearchFilter
+from .exports import EXPORT_FORMATS, STREAMERS, export_rows
+from .caching import cached_response, catalog_version, request_signature
+from .facets import facet_counts, requested_facets
+from .importers import ImportFormatError, detect_format, import_books, read_rows, text_stream
 from rest_framework import filters
+from advanced_api_project.budgets import budget
 
 
 # Create your views here.
+@budget(queries=4, ms=30, url='/api/books/?search=Book&ordering=-publication_year&facets=decade,author', login=True)
 class BookListView(generics.ListAPIView):
-    queryset = Book.objects.all()
+    queryset = Book.objects.select_related('author')
     serializer_class = BookSerializer
-    permission_classes = [IsAuthenticated, IsAuthenticatedOrReadOnly]
-    filter_backends = [rest_framework.DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    filter_backends = [rest_framework.DjangoFilterBackend, BookSearchFilter, filters.OrderingFilter]
     filterset_class = BookFilter
-    search_fields = ['title', 'author', 'publication_year']
+    search_fields = ['title', 'author__name']
+    search_exact_fields = ['publication_year']
     ordering_fields = ['title', 'publication_year']
+    ordering = ['id']  # stable default order for pagination
 
-class BookDetailView(generics.RetrieveAPIView):
+    # Pages are read as .values() rows (book joined with its author) and turned into
+    # dicts by BookRowSerializer instead of going through model instances. They are
+    # cached per catalog version and normalized query parameters.
+    # ?facets=decade,author adds counts of the filtered books per decade and author.
+    def list(self, request, *args, **kwargs):
+        etag = f'books-{catalog_version()}-{request_signature(request)}'
+        return cached_response(request, etag, self.build_page)
+
+    def build_page(self):
+        facets = requested_facets(self.request)
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.values(*BookRowSerializer.values_fields)
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return BookRowSerializer(rows, many=True).data
+        data = self.get_paginated_response(BookRowSerializer(page, many=True).data).data
+        if facets:
+            data['facets'] = facet_counts(self.request, queryset, facets)
+        return data
+
+
+# Whole-catalog export as CSV or NDJSON, honoring the list view's filter, search and
+# ordering parameters. Rows are streamed straight from the database cursor.
+class BookExportView(generics.GenericAPIView):
     queryset = Book.objects.all()
+    permission_classes = BookListView.permission_classes
+    filter_backends = BookListView.filter_backends
+    filterset_class = BookListView.filterset_class
+    search_fields = BookListView.search_fields
+    search_exact_fields = BookListView.search_exact_fields
+    ordering_fields = BookListView.ordering_fields
+    ordering = BookListView.ordering
+
+    # The body isn't produced by a DRF renderer, so Accept: text/csv must not 406
+    def perform_content_negotiation(self, request, force=False):
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, fmt, *args, **kwargs):
+        if fmt not in STREAMERS:
+            raise Http404
+        rows = export_rows(self.filter_queryset(self.get_queryset()))
+        response = StreamingHttpResponse(STREAMERS[fmt](rows), content_type=EXPORT_FORMATS[fmt])
+        response['Content-Disposition'] = f'attachment; filename="books.{fmt}"'
+        return response
+
+@budget(queries=2, ms=30, url=lambda fixtures: f"/api/books/{fixtures['book'].pk}/")
+class BookDetailView(generics.RetrieveAPIView):
+    queryset = Book.objects.select_related('author')
     serializer_class = BookSerializer
+
+    # The ETag comes from the book's and its author's row versions, read with one
+    # indexed lookup; the serialized book is cached under it
+    def retrieve(self, request, *args, **kwargs):
+        versions = self.get_queryset().filter(pk=kwargs['pk']).values_list('version', 'author__version').first()
+        if versions is None:
+            raise Http404
+        etag = f'book-{kwargs["pk"]}-{versions[0]}-{versions[1]}-{request_signature(request)}'
+        return cached_response(request, etag, lambda: self.get_serializer(self.get_object()).data)
     
 
 class BookCreateView(generics.CreateAPIView):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
+    permission_classes = [IsAuthenticated]
 
 class BookUpdateView(generics.UpdateAPIView):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
+    permission_classes = [IsAuthenticated]
 
 class BookDeleteView(generics.DestroyAPIView):
     queryset = Book.objects.all()
-    serializer_class = BookSerializer
\ No newline at end of file
+    serializer_class = BookSerializer
+    permission_classes = [IsAuthenticated]
+
+
+# Catalog loads: upload a CSV, NDJSON or JSON array file as `file` (multipart); the
+# format comes from a `format` form field or the file name. Rows stream from the uploaded file
+# through the same importer as the import_books command.
+class BookImportView(generics.GenericAPIView):
+    queryset = Book.objects.all()
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'file': ["No file was submitted."]}, status=status.HTTP_400_BAD_REQUEST)
+        fmt = request.data.get('format') or detect_format(upload.name)
+        try:
+            report = import_books(read_rows(text_stream(upload), fmt))
+        except (ImportFormatError, UnicodeDecodeError) as exc:
+            return Response({'file': [str(exc)]}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report.as_dict(), status=status.HTTP_201_CREATED)
+
+
+# Catalog syncs: POST a list of books to create them, PATCH a list of partial books
+# (each with its id) to update them, DELETE {"ids": [...]} to remove them.
+class BookBulkView(generics.GenericAPIView):
+    queryset = Book.objects.all()
+    serializer_class = BookBulkSerializer
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def patch(self, request, *args, **kwargs):
+        serializer = self.get_serializer(self.get_queryset(), data=request.data, many=True, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
+
+    def delete(self, request, *args, **kwargs):
+        serializer = BookBulkDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = sorted(set(serializer.validated_data['ids']))
+        deleted = 0
+        for start in range(0, len(ids), BULK_CHUNK_SIZE):
+            # Book has no dependents, so this is a single DELETE ... WHERE id IN (...)
+            deleted += self.get_queryset().filter(id__in=ids[start:start + BULK_CHUNK_SIZE]).delete()[0]
+        return Response({'deleted': deleted})
+
+
+# Authors with their books and stats. A page costs three queries (count, authors with
+# their annotated stats, one prefetch of all their books) and is cached per catalog
+# version like the book list, so repeated pages cost none.
+def author_queryset():
+    return Author.objects.annotate(
+        book_count=Count('book'),
+        first_publication_year=Min('book__publication_year'),
+        last_publication_year=Max('book__publication_year'),
+    ).prefetch_related(
+        Prefetch('book_set', queryset=Book.objects.only('id', 'title', 'publication_year', 'author_id')
+                 .order_by('publication_year', 'title'))
+    )
+
+@budget(queries=3, ms=40, url='/api/authors/?ordering=-book_count')
+class AuthorListView(generics.ListAPIView):
+    serializer_class = AuthorDetailSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    search_fields = ['name']
+    ordering_fields = ['name', 'book_count']
+    ordering = ['name', 'id']
+
+    def get_queryset(self):
+        return author_queryset()
+
+    def list(self, request, *args, **kwargs):
+        etag = f'authors-{catalog_version()}-{request_signature(request)}'
+        return cached_response(request, etag, self.build_page)
+
+    def build_page(self):
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        return self.get_paginated_response(self.get_serializer(page, many=True).data).data
+
+class AuthorDetailView(generics.RetrieveAPIView):
+    serializer_class = AuthorDetailSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    def get_queryset(self):
+        return author_queryset()
+
+    def retrieve(self, request, *args, **kwargs):
+        etag = f'author-{kwargs["pk"]}-{catalog_version()}-{request_signature(request)}'
+        return cached_response(request, etag, lambda: self.get_serializer(self.get_object()).data)
@@ -0,0 +1,88 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db.models import Case, DateTimeField, Value, When
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+from .models import AuthToken
+
+
+# --------------------------
+# last_used buffer
+# --------------------------
+# Authenticating doesn't write to the token table. Uses are collected here and written
+# after the response has gone out, at most every AUTH_TOKEN_LAST_USED_FLUSH seconds,
+# as one UPDATE per FLUSH_CHUNK_SIZE tokens seen since the previous flush.
+
+# Each token takes 3 query parameters (pk IN, WHEN pk, THEN value), so a chunk stays
+# under SQLite's 999-variable limit of older builds
+FLUSH_CHUNK_SIZE = 300
+
+
+class LastUsedBuffer:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.flushed_at = time.monotonic()
+
+    def record(self, token, now):
+        # Tokens whose stored last_used is still fresh enough are skipped entirely
+        if token.last_used and (now - token.last_used).total_seconds() < settings.AUTH_TOKEN_LAST_USED_FLUSH:
+            return
+        with self.lock:
+            self.pending[token.pk] = now
+
+    def due(self):
+        return bool(self.pending) and time.monotonic() - self.flushed_at >= settings.AUTH_TOKEN_LAST_USED_FLUSH
+
+    def flush(self):
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            self.flushed_at = time.monotonic()
+        items = list(pending.items())
+        for start in range(0, len(items), FLUSH_CHUNK_SIZE):
+            chunk = items[start:start + FLUSH_CHUNK_SIZE]
+            AuthToken.objects.filter(pk__in=[pk for pk, _ in chunk]).update(last_used=Case(
+                *(When(pk=pk, then=Value(used)) for pk, used in chunk),
+                output_field=DateTimeField(),
+            ))
+        return len(items)
+
+
+last_used_buffer = LastUsedBuffer()
+
+
+@receiver(request_finished)
+def flush_last_used(sender, **kwargs):
+    if last_used_buffer.due():
+        last_used_buffer.flush()
+
+
+# --------------------------
+# Authentication
+# --------------------------
+class ExpiringTokenAuthentication(TokenAuthentication):
+    """
+    `Authorization: Token <key>` against AuthToken; expired tokens are refused
+    (and removed later by the cleanup_tokens command).
+    """
+    model = AuthToken
+
+    def authenticate_credentials(self, key):
+        try:
+            token = AuthToken.objects.select_related('user').get(key=key)
+        except AuthToken.DoesNotExist:
+            raise exceptions.AuthenticationFailed('Invalid token.')
+        now = timezone.now()
+        if token.expires <= now:
+            raise exceptions.AuthenticationFailed('Token has expired.')
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+        last_used_buffer.record(token, now)
+        return token.user, token
@@ -0,0 +1,13 @@
+from django.contrib.auth.models import User
+
+from .models import Book
+
+BOOKS = 1000
+
+
+def seed():
+    """Data the performance budgets are checked against: a 1,000 book catalog."""
+    Book.objects.bulk_create(Book(title=f'Book {i}', author=f'Author {i % 50}') for i in range(BOOKS))
+    # Unusable password: keeps the password hasher out of the seeding time
+    user = User.objects.create(username='budget-reader', password='!')
+    return {'user': user, 'book': Book.objects.order_by('pk').first()}
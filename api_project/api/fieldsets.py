@@ -0,0 +1,71 @@
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+# Query parameter listing the fields a client wants, e.g. ?fields=id,title
+FIELDS_PARAM = 'fields'
+
+
+def requested_fields(request):
+    if request is None or request.method != 'GET' or not request.query_params.get(FIELDS_PARAM):
+        return None
+    return [name for name in request.query_params[FIELDS_PARAM].split(',') if name]
+
+
+class SparseFieldsetSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer that only outputs the fields named in ?fields= (all of them
+    when the parameter is missing).
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        wanted = requested_fields(self.context.get('request'))
+        if wanted is None:
+            return fields
+        unknown = sorted(set(wanted) - fields.keys())
+        if unknown:
+            raise ValidationError({FIELDS_PARAM: [f"Unknown field {name!r}." for name in unknown]})
+        return {name: field for name, field in fields.items() if name in wanted}
+
+
+class SparseFieldsetMixin:
+    """
+    View mixin that loads only the model columns behind the requested fields
+    (plus the primary key and the pagination ordering) with .only().
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if requested_fields(self.request) is None:
+            return queryset
+        return queryset.only(*self.serializer_columns(queryset))
+
+    def serializer_columns(self, queryset):
+        serializer = self.get_serializer()
+        columns = {queryset.model._meta.pk.attname}
+        ordering = getattr(self.paginator, 'ordering', None)
+        if isinstance(ordering, str):
+            columns.add(ordering.lstrip('-'))
+        for field in serializer.fields.values():
+            source = field.source.split('.')[0]
+            if source != '*' and hasattr(queryset.model, source):
+                columns.add(source)
+        return sorted(columns)
+
+
+class LiteListMixin(SparseFieldsetMixin):
+    """
+    Serves list() from lite rows of the columns the serializer reads (narrowed by
+    ?fields=); other actions keep model instances. The queryset's model needs a
+    LiteQuerySet manager.
+    """
+
+    def list(self, request, *args, **kwargs):
+        self.lite_rows = True
+        return super().list(request, *args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if not getattr(self, 'lite_rows', False):
+            return queryset
+        return queryset.lite(*self.serializer_columns(queryset))
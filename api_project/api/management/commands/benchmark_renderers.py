@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from api.models import Book
+from api.serializers import BookSerializer
+from api_project.renderers import compare_renderers
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare encode time and payload size of a BookViewSet page across the JSON, "
+        "orjson and MessagePack renderers, on a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--books', type=int, default=200, help="Books in the page (the API caps pages at 200).")
+        parser.add_argument('--repeat', type=int, default=20, help="Encodes per renderer; the best one is reported.")
+
+    def handle(self, *args, **options):
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            Book.objects.bulk_create(
+                Book(title=f'Book {i}', author=f'Author {i % 50}') for i in range(options['books'])
+            )
+            # Same payload shape as a BookViewSet page
+            data = {
+                'next': 'http://testserver/api/books_all/?cursor=cD0yMDA%3D',
+                'previous': None,
+                'results': BookSerializer(Book.objects.order_by('id'), many=True).data,
+            }
+            self.stdout.write(f"BookViewSet page with {len(data['results'])} books")
+            for result in compare_renderers(data, options['repeat']):
+                self.stdout.write(
+                    f"{result['renderer']:<22} {result['media_type']:<22} {result['ms']:>9.3f} ms  {result['bytes']:>10,} bytes"
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
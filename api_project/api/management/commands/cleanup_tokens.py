@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.models import AuthToken
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired API tokens in small chunks, each in its own short transaction, "
+        "so the token table is never locked for long."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--pause', type=float, default=0.0, help="Seconds to sleep between chunks.")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        deleted = 0
+        while True:
+            # The expires index finds each chunk; deleting by primary key keeps the
+            # DELETE (and its locks) to exactly those rows
+            ids = list(AuthToken.objects.filter(expires__lte=now)
+                       .order_by('expires').values_list('pk', flat=True)[:options['chunk_size']])
+            if not ids:
+                break
+            deleted += AuthToken.objects.filter(pk__in=ids).delete()[0]
+            if options['pause']:
+                time.sleep(options['pause'])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired tokens."))
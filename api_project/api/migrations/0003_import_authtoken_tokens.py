@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.db import migrations
+from django.db.migrations.exceptions import IrreversibleError
+from django.utils import timezone
+
+OLD_TABLE = 'authtoken_token'
+
+
+def import_tokens(apps, schema_editor):
+    # Keys issued by rest_framework.authtoken keep working as AuthTokens, with a full
+    # AUTH_TOKEN_TTL from now to rotate in. Only the keys are copied: authtoken_token
+    # and its migrations stay until rest_framework.authtoken is removed, a separate
+    # step (see INSTALLED_APPS)
+    connection = schema_editor.connection
+    if OLD_TABLE not in connection.introspection.table_names():
+        return
+    AuthToken = apps.get_model('api', 'AuthToken')
+    expires = timezone.now() + settings.AUTH_TOKEN_TTL
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT key, user_id, created FROM {schema_editor.quote_name(OLD_TABLE)}')
+        rows = cursor.fetchall()
+    imported = set(AuthToken.objects.filter(key__in=[key for key, _, _ in rows]).values_list('key', flat=True))
+    rows = [row for row in rows if row[0] not in imported]
+    tokens = AuthToken.objects.bulk_create(
+        (AuthToken(key=key, user_id=user_id, expires=expires) for key, user_id, _ in rows), batch_size=500
+    )
+    # created is auto_now_add, so the original issue times are written afterwards
+    for token, (_, _, created) in zip(tokens, rows):
+        token.created = created
+    AuthToken.objects.bulk_update(tokens, ['created'], batch_size=500)
+
+
+def export_tokens(apps, schema_editor):
+    # authtoken allows one key per user: each user without one gets their newest
+    # unexpired AuthToken back
+    connection = schema_editor.connection
+    if OLD_TABLE not in connection.introspection.table_names():
+        raise IrreversibleError(
+            f"{OLD_TABLE} is gone; migrate rest_framework.authtoken back in before reversing this migration."
+        )
+    AuthToken = apps.get_model('api', 'AuthToken')
+    table = schema_editor.quote_name(OLD_TABLE)
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT user_id FROM {table}')
+        users = {user_id for user_id, in cursor.fetchall()}
+        tokens = AuthToken.objects.filter(expires__gt=timezone.now()).order_by('user_id', '-created')
+        rows = []
+        for token in tokens.iterator():
+            if token.user_id not in users:
+                users.add(token.user_id)
+                rows.append((token.key, token.user_id, token.created))
+        cursor.executemany(f'INSERT INTO {table} (key, user_id, created) VALUES (%s, %s, %s)', rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_auth_tokens'),
+    ]
+
+    operations = [
+        migrations.RunPython(import_tokens, export_tokens),
+    ]
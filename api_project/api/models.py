@@ -1,8 +1,41 @@
+import secrets
+
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
+
+from .lite import LiteQuerySet
 
 class Book(models.Model):
     title = models.CharField(max_length=255)
     author = models.CharField(max_length=255)
 
+    objects = LiteQuerySet.as_manager()
+
     def __str__(self):
         return self.title
+
+
+def generate_token_key():
+    return secrets.token_hex(20)
+
+
+def token_expiry():
+    return timezone.now() + settings.AUTH_TOKEN_TTL
+
+
+# Replaces rest_framework.authtoken's Token: every token expires after
+# AUTH_TOKEN_TTL, a user may hold one per device, and last_used is kept (coarsely)
+class AuthToken(models.Model):
+    key = models.CharField(max_length=40, unique=True, default=generate_token_key)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='auth_tokens')
+    created = models.DateTimeField(auto_now_add=True)
+    expires = models.DateTimeField(default=token_expiry, db_index=True)
+    last_used = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'{self.user} token expiring {self.expires:%Y-%m-%d %H:%M}'
+
+    @property
+    def is_expired(self):
+        return self.expires <= timezone.now()
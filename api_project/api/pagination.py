@@ -0,0 +1,9 @@
+from rest_framework.pagination import CursorPagination
+
+
+# Cursor pagination over the primary key: every page is an indexed range scan, no
+# matter how deep, and rows inserted while paging don't shift later pages
+class IdCursorPagination(CursorPagination):
+    ordering = 'id'
+    page_size_query_param = 'page_size'
+    max_page_size = 200
@@ -1,7 +1,7 @@
-from rest_framework import serializers
+from .fieldsets import SparseFieldsetSerializer
 from .models import Book
 
-class BookSerializer(serializers.ModelSerializer):
+class BookSerializer(SparseFieldsetSerializer):
     class Meta:
         model = Book
         fields = '__all__'
@@ -1,3 +1,187 @@
+import importlib
+from unittest import mock, skipUnless
+
+from datetime import timedelta
+from io import StringIO
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.db import connection
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api_project import renderers
+from api_project.throttling import memory_store
+from .authentication import last_used_buffer
+from .models import AuthToken, Book
+from .serializers import BookSerializer
+
+
+class BookListTestCase(TestCase):
+    """
+    Tests for cursor pagination and sparse fieldsets of the book endpoints.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_user(username='reader', password='testpass123'))
+        Book.objects.bulk_create(Book(title=f'Book {i}', author=f'Author {i}') for i in range(5))
+
+    def test_cursor_pagination(self):
+        response = self.client.get('/api/books/', {'page_size': 2})
+        self.assertEqual([book['title'] for book in response.data['results']], ['Book 0', 'Book 1'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([book['title'] for book in response.data['results']], ['Book 2', 'Book 3'])
+        self.assertIsNotNone(response.data['previous'])
+
+    def test_sparse_fieldset(self):
+        """
+        Test that ?fields= narrows the payload and the selected columns.
+        """
+        with self.assertNumQueries(1) as queries:
+            response = self.client.get('/api/books_all/', {'fields': 'title'})
+        self.assertEqual(response.data['results'][0], {'title': 'Book 0'})
+        self.assertNotIn('"author"', queries.captured_queries[0]['sql'])
+
+        response = self.client.get(f'/api/books_all/{Book.objects.first().pk}/', {'fields': 'id,author'})
+        self.assertEqual(set(response.data), {'id', 'author'})
+
+    def test_lite_rows(self):
+        """
+        Test that lists are served from __slots__ rows that serialize like instances.
+        """
+        book = Book.objects.lite().get(title='Book 3')
+        self.assertEqual((book.pk, book.title, book.author), (book.id, 'Book 3', 'Author 3'))
+        self.assertFalse(hasattr(book, '__dict__'))
+        self.assertEqual(BookSerializer(book).data, BookSerializer(Book.objects.get(title='Book 3')).data)
+        self.assertEqual([row.title for row in Book.objects.lite('title').filter(title__lt='Book 2').order_by('title')],
+                         ['Book 0', 'Book 1'])
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/books_all/')
+        self.assertEqual(response.data['results'][0], {'id': Book.objects.first().pk, 'title': 'Book 0', 'author': 'Author 0'})
+
+    def test_unknown_field_rejected(self):
+        response = self.client.get('/api/books/', {'fields': 'title,isbn'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_create_with_idempotency_key(self):
+        data = {'title': 'Retried', 'author': 'Flaky Network'}
+        for _ in range(2):
+            response = self.client.post('/api/books_all/', data, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+            self.assertEqual(response.status_code, 201)
+        self.assertEqual(response['Idempotent-Replayed'], 'true')
+        self.assertEqual(Book.objects.filter(title='Retried').count(), 1)
+
+    @skipUnless(renderers.HAS_MSGPACK, 'msgpack is not installed')
+    def test_msgpack_by_accept_header(self):
+        response = self.client.get('/api/books_all/', {'fields': 'title'}, HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(renderers.msgpack.unpackb(response.content)['results'][0], {'title': 'Book 0'})
+
+
+class AuthTokenTestCase(TestCase):
+    """
+    Tests for expiring tokens, rotation, last-used batching and cleanup.
+    """
+
+    def setUp(self):
+        memory_store.clear()
+        self.user = User.objects.create_user(username='mobile', password='testpass123')
+        self.client = APIClient()
+
+    def obtain(self):
+        response = self.client.post('/api-token-auth/', {'username': 'mobile', 'password': 'testpass123'})
+        self.assertEqual(response.status_code, 201)
+        return response.data['token']
+
+    def test_token_authenticates_until_it_expires(self):
+        key = self.obtain()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
+        self.assertEqual(self.client.get('/api/books/').status_code, 200)
+
+        AuthToken.objects.filter(key=key).update(expires=timezone.now() - timedelta(seconds=1))
+        response = self.client.get('/api/books/')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data['detail'], 'Token has expired.')
+
+    def test_refresh_rotates_token(self):
+        old_key = self.obtain()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {old_key}')
+        new_key = self.client.post('/api-token-refresh/').data['token']
+        self.assertNotEqual(new_key, old_key)
+        self.assertEqual(self.client.get('/api/books/').status_code, 401)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {new_key}')
+        self.assertEqual(self.client.get('/api/books/').status_code, 200)
+
+    @override_settings(AUTH_TOKEN_LAST_USED_FLUSH=0)
+    def test_last_used_written_in_batches(self):
+        """
+        Test that uses are buffered and written by one UPDATE after the response.
+        """
+        tokens = [AuthToken.objects.create(user=self.user) for _ in range(3)]
+        last_used_buffer.flush()
+        for token in tokens:
+            last_used_buffer.record(token, timezone.now())
+        with self.assertNumQueries(1):
+            self.assertEqual(last_used_buffer.flush(), 3)
+        self.assertFalse(AuthToken.objects.filter(last_used__isnull=True).exists())
+
+        for token in tokens:
+            last_used_buffer.record(token, timezone.now())
+        with mock.patch('api.authentication.FLUSH_CHUNK_SIZE', 2), self.assertNumQueries(2):
+            self.assertEqual(last_used_buffer.flush(), 3)
+
+    def test_old_tokens_imported(self):
+        """
+        Test that keys from rest_framework.authtoken's table become AuthTokens,
+        and that the table is left in place.
+        """
+        migration = importlib.import_module('api.migrations.0003_import_authtoken_tokens')
+        issued = timezone.now() - timedelta(days=400)
+        with connection.cursor() as cursor:
+            cursor.execute('INSERT INTO authtoken_token (key, user_id, created) VALUES (%s, %s, %s)', ['oldkey', self.user.pk, issued])
+        migration.import_tokens(apps, connection.schema_editor())
+        migration.import_tokens(apps, connection.schema_editor())
+
+        token = AuthToken.objects.get(key='oldkey')
+        self.assertEqual((token.user, token.created), (self.user, issued))
+        self.assertFalse(token.is_expired)
+        self.assertIn('authtoken_token', connection.introspection.table_names())
+        self.client.credentials(HTTP_AUTHORIZATION='Token oldkey')
+        self.assertEqual(self.client.get('/api/books/').status_code, 200)
+
+    def test_tokens_exported_on_reverse(self):
+        migration = importlib.import_module('api.migrations.0003_import_authtoken_tokens')
+        other = User.objects.create_user(username='other', password='pass')
+        AuthToken.objects.create(user=other, key='otherkey')
+        AuthToken.objects.create(user=other, key='expiredkey', expires=timezone.now() - timedelta(days=1))
+        with connection.cursor() as cursor:
+            cursor.execute('INSERT INTO authtoken_token (key, user_id, created) VALUES (%s, %s, %s)', ['oldkey', self.user.pk, timezone.now()])
+            migration.export_tokens(apps, connection.schema_editor())
+            cursor.execute('SELECT key, user_id FROM authtoken_token ORDER BY key')
+            self.assertEqual(cursor.fetchall(), [('oldkey', self.user.pk), ('otherkey', other.pk)])
+
+    def test_cleanup_deletes_expired_tokens_in_chunks(self):
+        AuthToken.objects.bulk_create(
+            AuthToken(key=f'expired{i}', user=self.user, expires=timezone.now() - timedelta(days=1)) for i in range(5)
+        )
+        live = AuthToken.objects.create(user=self.user)
+        out = StringIO()
+        call_command('cleanup_tokens', chunk_size=2, stdout=out)
+        self.assertIn('Deleted 5 expired tokens', out.getvalue())
+        self.assertEqual(list(AuthToken.objects.all()), [live])
 
-# Create your tests here.
+    @override_settings(REST_FRAMEWORK={
+        'DEFAULT_AUTHENTICATION_CLASSES': ['api.authentication.ExpiringTokenAuthentication'],
+        'DEFAULT_THROTTLE_CLASSES': ['api_project.throttling.SlidingWindowThrottle'],
+        'DEFAULT_THROTTLE_RATES': {'login': '2/min'},
+    })
+    def test_token_requests_are_throttled(self):
+        self.obtain()
+        self.obtain()
+        response = self.client.post('/api-token-auth/', {'username': 'mobile', 'password': 'testpass123'})
+        self.assertEqual(response.status_code, 429)
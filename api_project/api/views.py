@@ -1,15 +1,55 @@
-from rest_framework import generics, viewsets, permissions
-from .models import Book
+from django.db import transaction
+from rest_framework import generics, viewsets, permissions, status
+from rest_framework.authtoken.serializers import AuthTokenSerializer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .models import Book, AuthToken
 from .serializers import BookSerializer
+from .fieldsets import LiteListMixin
+from api_project.budgets import budget
 
 # ListAPIView (optional)
-class BookList(generics.ListAPIView):
+# ?fields=id,title narrows both the JSON and the selected columns; lists are read
+# as lite rows instead of Book instances
+@budget(queries=1, ms=30, url='/api/books/', login=True)
+class BookList(LiteListMixin, generics.ListAPIView):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [permissions.IsAuthenticated]  # restrict access
+    throttle_scope = 'books'
 
 # BookViewSet with full CRUD and permissions
-class BookViewSet(viewsets.ModelViewSet):
+@budget(queries=1, ms=30, url=lambda fixtures: f"/api/books_all/{fixtures['book'].pk}/", login=True)
+class BookViewSet(LiteListMixin, viewsets.ModelViewSet):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [permissions.IsAuthenticated]  # only logged-in users can access
+    throttle_scope = 'books'
+
+
+# Tokens: log in with username/password for a new expiring token (one per device),
+# or trade a still-valid token for a fresh one before it expires
+def token_response(token, status_code=status.HTTP_200_OK):
+    return Response({'token': token.key, 'expires': token.expires}, status=status_code)
+
+class ObtainTokenView(APIView):
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+    throttle_scope = 'login'
+
+    def post(self, request):
+        serializer = AuthTokenSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        token = AuthToken.objects.create(user=serializer.validated_data['user'])
+        return token_response(token, status.HTTP_201_CREATED)
+
+class RefreshTokenView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        if not isinstance(request.auth, AuthToken):
+            return Response({'detail': 'Authenticate with the token to refresh.'}, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            request.auth.delete()
+            token = AuthToken.objects.create(user=request.user)
+        return token_response(token, status.HTTP_201_CREATED)
@@ -10,8 +10,13 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+from datetime import timedelta
+from importlib.util import find_spec
 from pathlib import Path
 
+from .database import database_settings
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -38,22 +43,77 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'rest_framework',
+    # Only holds the keys api's migration 0003 copied to AuthToken. Once every
+    # database has run it, drop the table with `manage.py migrate authtoken zero`
+    # and then remove the app from this list
     'rest_framework.authtoken',
     'api',
 ]
 
 
+# API tokens expire AUTH_TOKEN_TTL after they are issued; their last_used time is
+# written at most every AUTH_TOKEN_LAST_USED_FLUSH seconds
+AUTH_TOKEN_TTL = timedelta(days=7)
+AUTH_TOKEN_LAST_USED_FLUSH = 60
+
+# Faster wire formats when their libraries are installed: orjson for JSON, and
+# MessagePack (Accept: application/msgpack) as a binary alternative
+RENDERER_CLASSES = ['rest_framework.renderers.JSONRenderer', 'rest_framework.renderers.BrowsableAPIRenderer']
+PARSER_CLASSES = [
+    'rest_framework.parsers.JSONParser',
+    'rest_framework.parsers.FormParser',
+    'rest_framework.parsers.MultiPartParser',
+]
+if find_spec('orjson'):
+    RENDERER_CLASSES.insert(0, 'api_project.renderers.ORJSONRenderer')
+    PARSER_CLASSES.insert(0, 'api_project.renderers.ORJSONParser')
+if find_spec('msgpack'):
+    RENDERER_CLASSES.append('api_project.renderers.MessagePackRenderer')
+    PARSER_CLASSES.append('api_project.renderers.MessagePackParser')
+
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': RENDERER_CLASSES,
+    'DEFAULT_PARSER_CLASSES': PARSER_CLASSES,
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'api.authentication.ExpiringTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
-    ]
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.IdCursorPagination',
+    'PAGE_SIZE': 50,
+    'DEFAULT_THROTTLE_CLASSES': [
+        'api_project.throttling.SlidingWindowThrottle',
+    ],
+    # Per scope: views set throttle_scope, the others fall back to user/anon
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': '60/min',
+        'user': '600/min',
+        'books': '1200/min',
+        'login': '10/min',
+    },
 }
 
+# POSTs with an Idempotency-Key header replay their first response for this long
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60
+
+# Throttle counters live in process memory; 'cache' shares them through CACHES
+# between processes
+THROTTLE_BACKEND = 'memory'
+
+# Performance budgets declared on the views with @budget; see api_project/budgets.py
+TEST_RUNNER = 'api_project.budgets.BudgetTestRunner'
+BUDGET_SEED = 'api.budgets.seed'
+BUDGET_CLIENT = 'rest_framework.test.APIClient'
+BUDGET_REPEAT = 5
+BUDGET_HISTORY = BASE_DIR / 'budget_history.jsonl'
+# Scales every latency budget, for machines slower than the ones budgets were set
+# on; CI runners (CI set) default to 3
+BUDGET_LATENCY_FACTOR = float(os.environ.get('BUDGET_LATENCY_FACTOR', 3 if os.environ.get('CI') else 1))
+
 
 MIDDLEWARE = [
+    'api_project.database.DatabaseMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -61,6 +121,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api_project.idempotency.IdempotencyMiddleware',
 ]
 
 ROOT_URLCONF = 'api_project.urls'
@@ -86,13 +147,15 @@ WSGI_APPLICATION = 'api_project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# DATABASE_PROFILE=dev (SQLite, the default), persistent or pooled (PostgreSQL at
+# DATABASE_URL); see api_project/database.py for the pool and lifetime knobs
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_settings(BASE_DIR),
 }
 
+# Seconds between the connection and pool metrics DatabaseMetricsMiddleware logs
+DATABASE_METRICS_INTERVAL = 60
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
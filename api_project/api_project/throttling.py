@@ -0,0 +1,125 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+# --------------------------
+# Sliding-window counters
+# --------------------------
+# Each client gets a counter for the current fixed window and keeps the previous
+# window's count. The request rate is estimated as
+#     previous * (share of the previous window still inside the sliding window) + current
+# which smooths out bursts at window edges for two integers of state per client.
+
+def _estimate(current, previous, offset, duration):
+    return previous * (1 - offset / duration) + current
+
+
+def _wait(current, previous, limit, offset, duration):
+    # Seconds until the estimate drops below the limit again
+    if current >= limit or not previous:
+        return duration - offset
+    return max(0.0, duration * (1 - (limit - current) / previous) - offset)
+
+
+class MemoryWindowStore:
+    """
+    Counters in a dict of this process; a decision takes a lock and a few operations.
+    The dict is kept in order of last use, and past max_keys the least recently
+    seen clients are dropped (their windows have almost always ended already).
+    """
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self.lock = threading.Lock()
+        self.windows = OrderedDict()  # key -> [window index, current count, previous count, duration]
+
+    def acquire(self, key, limit, duration, now):
+        index, offset = divmod(now, duration)
+        with self.lock:
+            entry = self.windows.get(key)
+            if entry is None or entry[0] < index - 1:
+                current = previous = 0
+            elif entry[0] == index - 1:
+                current, previous = 0, entry[1]
+            else:
+                current, previous = entry[1], entry[2]
+
+            allowed = _estimate(current, previous, offset, duration) < limit
+            self.windows[key] = [index, current + 1 if allowed else current, previous, duration]
+            self.windows.move_to_end(key)
+            while len(self.windows) > self.max_keys:
+                self.windows.popitem(last=False)
+        if not allowed:
+            return False, _wait(current, previous, limit, offset, duration)
+        return True, 0.0
+
+    def clear(self):
+        with self.lock:
+            self.windows.clear()
+
+
+class CacheWindowStore:
+    """Counters in the shared cache, for deployments running several processes."""
+
+    def acquire(self, key, limit, duration, now):
+        index, offset = divmod(now, duration)
+        current_key, previous_key = f'throttle:{key}:{index:.0f}', f'throttle:{key}:{index - 1:.0f}'
+        counts = cache.get_many([current_key, previous_key])
+        current, previous = counts.get(current_key, 0), counts.get(previous_key, 0)
+        if _estimate(current, previous, offset, duration) >= limit:
+            return False, _wait(current, previous, limit, offset, duration)
+        if not cache.add(current_key, 1, timeout=2 * duration):
+            try:
+                cache.incr(current_key)
+            except ValueError:
+                cache.set(current_key, 1, timeout=2 * duration)
+        return True, 0.0
+
+    def clear(self):
+        pass
+
+
+memory_store = MemoryWindowStore()
+
+
+def get_store():
+    if getattr(settings, 'THROTTLE_BACKEND', 'memory') == 'cache':
+        return CacheWindowStore()
+    return memory_store
+
+
+# --------------------------
+# Throttle
+# --------------------------
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Rate limit per view and per client. The view's `throttle_scope` (or 'user' /
+    'anon' when it has none) picks the rate in DEFAULT_THROTTLE_RATES; clients are
+    told apart by user id, or by IP address when anonymous. Scopes without a rate
+    aren't limited.
+    """
+
+    def __init__(self):
+        # The rate depends on the view, so it is resolved in allow_request()
+        self.wait_seconds = None
+
+    def allow_request(self, request, view):
+        authenticated = request.user and request.user.is_authenticated
+        self.scope = getattr(view, 'throttle_scope', None) or ('user' if authenticated else 'anon')
+        self.rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        ident = request.user.pk if authenticated else self.get_ident(request)
+        allowed, self.wait_seconds = get_store().acquire(
+            f'{self.scope}:{ident}', self.num_requests, self.duration, self.timer()
+        )
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
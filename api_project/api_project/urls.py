@@ -16,11 +16,12 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from rest_framework.authtoken.views import obtain_auth_token
+from api.views import ObtainTokenView, RefreshTokenView
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('api.urls')),
-    path('api-token-auth/', obtain_auth_token, name='api_token_auth'),
+    path('api-token-auth/', ObtainTokenView.as_view(), name='api_token_auth'),
+    path('api-token-refresh/', RefreshTokenView.as_view(), name='api_token_refresh'),
 ]
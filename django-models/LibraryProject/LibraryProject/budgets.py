@@ -0,0 +1 @@
+../../../django_perf/budgets.py
\ No newline at end of file
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -38,6 +39,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'bookshelf',
+    'relationship_app',
 ]
 
 MIDDLEWARE = [
@@ -121,3 +123,13 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Performance budgets declared on the views with @budget; see LibraryProject/budgets.py
+TEST_RUNNER = 'LibraryProject.budgets.BudgetTestRunner'
+BUDGET_SEED = 'relationship_app.budgets.seed'
+BUDGET_CLIENT = 'django.test.Client'
+BUDGET_REPEAT = 5
+BUDGET_HISTORY = BASE_DIR / 'budget_history.jsonl'
+# Scales every latency budget, for machines slower than the ones budgets were set
+# on; CI runners (CI set) default to 3
+BUDGET_LATENCY_FACTOR = float(os.environ.get('BUDGET_LATENCY_FACTOR', 3 if os.environ.get('CI') else 1))
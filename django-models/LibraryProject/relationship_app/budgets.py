@@ -0,0 +1,17 @@
+from django.contrib.auth.models import User
+
+from .models import Author, Book, Library
+
+
+def seed():
+    """Data the performance budgets are checked against: a catalog and a large library."""
+    authors = Author.objects.bulk_create(Author(name=f'Author {i}') for i in range(50))
+    books = Book.objects.bulk_create(
+        Book(title=f'Book {i}', author=authors[i % len(authors)]) for i in range(1000)
+    )
+    library = Library.objects.create(name='Central Library')
+    library.books.set(books[:300])
+    return {
+        'user': User.objects.create_user(username='budget', password='budget'),
+        'library': library,
+    }
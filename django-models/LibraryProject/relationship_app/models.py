@@ -3,6 +3,8 @@ from django.contrib.auth.models import User
 from django.dispatch import receiver
 from django.db.models.signals import post_save
 
+from .lite import LiteQuerySet
+
 # Create your models here.
 class Author(models.Model):
     name = models.CharField(max_length=100)
@@ -14,6 +16,9 @@ class Book(models.Model):
     title = models.CharField(max_length=200)
     author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name='books')
 
+    objects = LiteQuerySet.as_manager()
+    lite_methods = ('__str__',)
+
     def __str__(self):
         return self.title
     
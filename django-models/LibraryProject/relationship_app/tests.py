@@ -1,3 +1,24 @@
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from .models import Author, Book
+
+
+class ListBooksTestCase(TestCase):
+    """
+    Tests for the book list served from lite rows.
+    """
+
+    def setUp(self):
+        orwell = Author.objects.create(name='George Orwell')
+        Book.objects.create(title='1984', author=orwell)
+        Book.objects.create(title='Animal Farm', author=orwell)
+
+    def test_list_books(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('book_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '1984 by George Orwell')
+        book = response.context['books'][0]
+        self.assertEqual((str(book), book.author.name), ('1984', 'George Orwell'))
+        self.assertFalse(hasattr(book, '__dict__'))
@@ -6,19 +6,28 @@ from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib import messages
 from django.contrib.auth.decorators import user_passes_test
+from LibraryProject.budgets import budget
 
 # Function-based view to list all books
+@budget(queries=1, ms=40, url='/books/')
 def list_books(request):
-    books = Book.objects.all()  # Query all books
+    books = Book.objects.lite('id', 'title', 'author__name')  # Read-only rows of all books, with author names
     context = {'books': books}
     return render(request, 'relationship_app/list_books.html', context)
 
 
+@budget(queries=2, ms=40, url=lambda fixtures: f"/library/{fixtures['library'].pk}/")
 class LibraryDetailView(DetailView):
     model = Library
     template_name = 'relationship_app/library_detail.html'
     context_object_name = 'library'
 
+    def get_context_data(self, **kwargs):
+        # The library's books with their authors, in one query
+        context = super().get_context_data(**kwargs)
+        context['books'] = self.object.books.select_related('author')
+        return context
+
 
 # User registration view
 def register(request):
@@ -0,0 +1,213 @@
+import json
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+
+import django
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
+from django.test import Client
+from django.urls import reverse
+from taggit.models import Tag, TaggedItem
+
+from .models import Post, Comment, _path_segment
+
+BATCH_SIZE = 5000
+TAGS_PER_POST = 3
+PERCENTILES = (50, 90, 95, 99)
+
+# Metrics compared against a baseline (higher is worse for all of them)
+COMPARED_METRICS = ('p95_ms', 'queries_max', 'peak_memory_kb')
+
+
+# --------------------------
+# Seeding
+# --------------------------
+def _batches(iterable, size=BATCH_SIZE):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+@transaction.atomic
+def seed(posts=10000, tags=500, comments=50000, authors=None, seed_value=42):
+    """Bulk insert a realistic data set; returns the counts that were created."""
+    rng = random.Random(seed_value)
+    authors = authors or max(10, posts // 100)
+
+    # Unusable passwords keep the password hasher out of the seeding time
+    User.objects.bulk_create(
+        (User(username=f'bench-author-{i}', password='!') for i in range(authors)),
+        batch_size=BATCH_SIZE,
+    )
+    author_ids = list(User.objects.filter(username__startswith='bench-author-').values_list('pk', flat=True))
+
+    for batch in _batches(
+        Post(
+            title=f'Benchmark post {i}',
+            slug=f'benchmark-post-{i}',  # bulk_create skips Post.save()
+            content=f'Post {i} body. ' * rng.randint(5, 60),
+            author_id=rng.choice(author_ids),
+        )
+        for i in range(posts)
+    ):
+        Post.objects.bulk_create(batch)
+    post_ids = list(Post.objects.values_list('pk', flat=True))
+
+    Tag.objects.bulk_create(
+        (Tag(name=f'tag-{i}', slug=f'tag-{i}') for i in range(tags)), batch_size=BATCH_SIZE
+    )
+    tag_ids = list(Tag.objects.values_list('pk', flat=True))
+    post_type = ContentType.objects.get_for_model(Post)
+    for batch in _batches(
+        TaggedItem(content_type=post_type, object_id=post_id, tag_id=tag_id)
+        for post_id in post_ids
+        for tag_id in rng.sample(tag_ids, min(TAGS_PER_POST, len(tag_ids)))
+    ):
+        TaggedItem.objects.bulk_create(batch)
+
+    # A third of the comments are replies to an earlier comment of the same post
+    roots = comments - comments // 3
+    for batch in _batches(
+        Comment(post_id=rng.choice(post_ids), author_id=rng.choice(author_ids), content=f'Comment {i}')
+        for i in range(roots)
+    ):
+        created = Comment.objects.bulk_create(batch)
+        for comment in created:
+            comment.path = _path_segment(comment.pk)
+        Comment.objects.bulk_update(created, ['path'])
+
+    parents = list(Comment.objects.values_list('pk', 'post_id', 'path', 'depth'))
+    for batch in _batches(
+        Comment(post_id=post_id, parent_id=pk, depth=depth + 1, path=path,
+                author_id=rng.choice(author_ids), content=f'Reply {i}')
+        for i, (pk, post_id, path, depth) in enumerate(rng.choice(parents) for _ in range(comments - roots))
+    ):
+        created = Comment.objects.bulk_create(batch)
+        for comment in created:
+            comment.path += _path_segment(comment.pk)
+        Comment.objects.bulk_update(created, ['path'])
+
+    return {'authors': authors, 'posts': posts, 'tags': tags, 'comments': comments}
+
+
+# --------------------------
+# Measuring
+# --------------------------
+def scenarios():
+    """URLs exercised by the benchmark, keyed by scenario name."""
+    slugs = list(Post.objects.order_by('?').values_list('slug', flat=True)[:50])
+    tag = Tag.objects.order_by('pk').values_list('name', flat=True).first() or 'tag-0'
+    return {
+        'home': [reverse('home')],
+        'post_list': [reverse('post-list')],
+        'post_detail': [reverse('post-detail', args=[slug]) for slug in slugs],
+        'search_posts': [reverse('search-posts') + f'?q={tag}'],
+        'posts_by_tag': [reverse('posts-by-tag', args=[tag])],
+    }
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class _QueryCounter:
+    # Counts through an execute wrapper, which unlike connection.queries has no size cap
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def measure(urls, requests=20, warmup=2):
+    client = Client()
+    for i in range(warmup):
+        client.get(urls[i % len(urls)])
+
+    timings = []
+    queries = []
+    for i in range(requests):
+        counter = _QueryCounter()
+        with connection.execute_wrapper(counter):
+            start = time.perf_counter()
+            response = client.get(urls[i % len(urls)])
+            timings.append((time.perf_counter() - start) * 1000)
+        if response.status_code != 200:
+            raise RuntimeError(f'{urls[i % len(urls)]} returned {response.status_code}')
+        queries.append(counter.count)
+
+    # Memory is measured separately because tracing slows every allocation down
+    tracemalloc.start()
+    client.get(urls[0])
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    result = {f'p{p}_ms': round(_percentile(timings, p), 3) for p in PERCENTILES}
+    result.update({
+        'mean_ms': round(statistics.fmean(timings), 3),
+        'max_ms': round(max(timings), 3),
+        'queries_mean': round(statistics.fmean(queries), 2),
+        'queries_max': max(queries),
+        'peak_memory_kb': round(peak / 1024, 1),
+        'requests': requests,
+    })
+    return result
+
+
+def run(requests=20, only=None):
+    """Drive every scenario through the test client and return the JSON report."""
+    results = {}
+    for name, urls in scenarios().items():
+        if not only or name in only:
+            results[name] = measure(urls, requests=requests)
+    return {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'counts': {
+                'posts': Post.objects.count(),
+                'comments': Comment.objects.count(),
+                'tags': Tag.objects.count(),
+            },
+        },
+        'results': results,
+    }
+
+
+# --------------------------
+# Comparing
+# --------------------------
+def compare(report, baseline, tolerance=0.1):
+    """Return a list of regressions of `report` against `baseline`.
+
+    Latency and memory may grow by `tolerance` (a fraction); query counts may not grow.
+    """
+    regressions = []
+    for name, current in report['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if previous is None:
+            continue
+        for metric in COMPARED_METRICS:
+            allowed = previous[metric] if metric.startswith('queries') else previous[metric] * (1 + tolerance)
+            if current[metric] > allowed:
+                regressions.append(f'{name}: {metric} {current[metric]} > {previous[metric]} (baseline)')
+    return regressions
+
+
+def load_report(path):
+    with open(path) as handle:
+        return json.load(handle)
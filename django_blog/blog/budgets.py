@@ -0,0 +1,17 @@
+from django.contrib.auth.models import User
+from django.db.models import Count
+from taggit.models import Tag
+
+from .benchmarks import seed as seed_blog
+from .models import Post
+
+
+def seed():
+    """Data the performance budgets are checked against: a small but busy blog."""
+    seed_blog(posts=300, tags=30, comments=1500)
+    post = Post.objects.annotate(comment_count=Count('comments')).order_by('-comment_count', 'pk').first()
+    return {
+        'user': User.objects.order_by('pk').first(),
+        'post': post,
+        'tag': Tag.objects.order_by('pk').first().name,
+    }
@@ -0,0 +1,177 @@
+import hashlib
+import json
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import feedgenerator
+
+from taggit.models import Tag
+
+from .models import Post
+
+# Number of most recent posts published in every feed
+FEED_SIZE = 20
+
+FEED_FORMATS = ('rss', 'atom', 'json')
+
+# Seconds a snapshot stays cached. Writes keep snapshots current through the
+# signals below; the timeout only lets the feeds of quiet tags and authors expire
+SNAPSHOT_TIMEOUT = 24 * 60 * 60
+
+FEED_TITLES = {
+    'all': 'Django Blog',
+    'tag': 'Django Blog - posts tagged "{}"',
+    'author': 'Django Blog - posts by {}',
+}
+
+
+# --------------------------
+# Snapshots
+# --------------------------
+# Every feed (all posts, one tag, one author) is served from a snapshot kept in the
+# cache: the newest FEED_SIZE posts as plain dicts plus the ETag and Last-Modified
+# values. Polling a feed therefore only reads the cache; the snapshot is patched in
+# place when a post is saved and dropped when it can't be patched (delete, tag change).
+
+def _snapshot_key(kind, value=None):
+    return f'blog:feed:{kind}:{value or ""}'
+
+
+def _post_item(post):
+    return {
+        'id': post.pk,
+        'title': post.title,
+        'link': post.get_absolute_url(),
+        'content': post.content,
+        'author': post.author.username,
+        'published': post.published_date,
+    }
+
+
+def _build_snapshot(items):
+    items = sorted(items, key=lambda item: (item['published'], item['id']), reverse=True)[:FEED_SIZE]
+    updated = items[0]['published'] if items else None
+    digest = hashlib.md5(
+        json.dumps([(item['id'], item['title'], item['content']) for item in items]).encode()
+    ).hexdigest()[:12]
+    stamp = int(updated.timestamp()) if updated else 0
+    return {'items': items, 'updated': updated, 'etag': f'{stamp}-{digest}'}
+
+
+def _feed_queryset(kind, value):
+    posts = Post.objects.select_related('author').order_by('-published_date', '-pk')
+    if kind == 'tag':
+        posts = posts.filter(tags__name__in=[value])
+    elif kind == 'author':
+        posts = posts.filter(author__username=value)
+    return posts[:FEED_SIZE]
+
+
+def _feed_exists(kind, value):
+    if kind == 'tag':
+        return Tag.objects.filter(name=value).exists()
+    if kind == 'author':
+        return User.objects.filter(username=value).exists()
+    return True
+
+
+def get_snapshot(kind, value=None):
+    """The feed's snapshot, or None for the feed of an unknown tag or author."""
+    key = _snapshot_key(kind, value)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        items = [_post_item(post) for post in _feed_queryset(kind, value)]
+        # Only feeds that exist are cached, so made-up names can't fill the cache
+        if not items and not _feed_exists(kind, value):
+            return None
+        snapshot = _build_snapshot(items)
+        cache.set(key, snapshot, SNAPSHOT_TIMEOUT)
+    return snapshot
+
+
+def _tag_keys(post):
+    return [_snapshot_key('tag', name) for name in post.tags.names()]
+
+
+@receiver(post_save, sender=Post)
+def update_feed_snapshots(sender, instance, **kwargs):
+    # The global and the author feed are patched incrementally; tag feeds are dropped
+    # because the post's tags are usually saved after the post itself.
+    item = _post_item(instance)
+    for key in (_snapshot_key('all'), _snapshot_key('author', item['author'])):
+        snapshot = cache.get(key)
+        if snapshot is not None:
+            items = [i for i in snapshot['items'] if i['id'] != item['id']]
+            cache.set(key, _build_snapshot(items + [item]), SNAPSHOT_TIMEOUT)
+    cache.delete_many(_tag_keys(instance))
+
+
+@receiver(pre_delete, sender=Post)
+def remember_deleted_post_tags(sender, instance, **kwargs):
+    instance._feed_tag_keys = _tag_keys(instance)
+
+
+@receiver(post_delete, sender=Post)
+def drop_deleted_post_snapshots(sender, instance, **kwargs):
+    # A removed post leaves a hole that only the database can fill
+    keys = [_snapshot_key('all'), _snapshot_key('author', instance.author.username)]
+    cache.delete_many(keys + getattr(instance, '_feed_tag_keys', []))
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def drop_tag_snapshots(sender, instance, action, pk_set, model, **kwargs):
+    if action in ('pre_clear', 'post_add', 'post_remove'):
+        names = instance.tags.names() if action == 'pre_clear' else (
+            model.objects.filter(pk__in=pk_set or []).values_list('name', flat=True)
+        )
+        cache.delete_many([_snapshot_key('tag', name) for name in names])
+
+
+# --------------------------
+# Rendering
+# --------------------------
+def feed_title(kind, value=None):
+    return FEED_TITLES[kind].format(value)
+
+
+def render_feed(request, fmt, snapshot, kind, value=None):
+    """Return (content, content_type) for a snapshot in the requested format."""
+    title = feed_title(kind, value)
+    home_url = request.build_absolute_uri('/')
+    feed_url = request.build_absolute_uri()
+
+    if fmt == 'json':
+        feed = {
+            'version': 'https://jsonfeed.org/version/1.1',
+            'title': title,
+            'home_page_url': home_url,
+            'feed_url': feed_url,
+            'items': [
+                {
+                    'id': str(item['id']),
+                    'url': request.build_absolute_uri(item['link']),
+                    'title': item['title'],
+                    'content_text': item['content'],
+                    'date_published': item['published'].isoformat(),
+                    'authors': [{'name': item['author']}],
+                }
+                for item in snapshot['items']
+            ],
+        }
+        return json.dumps(feed), 'application/feed+json; charset=utf-8'
+
+    generator = feedgenerator.Atom1Feed if fmt == 'atom' else feedgenerator.Rss201rev2Feed
+    feed = generator(title=title, link=home_url, description=title, feed_url=feed_url, language='en')
+    for item in snapshot['items']:
+        link = request.build_absolute_uri(item['link'])
+        feed.add_item(
+            title=item['title'],
+            link=link,
+            unique_id=link,
+            description=item['content'],
+            author_name=item['author'],
+            pubdate=item['published'],
+        )
+    return feed.writeString('utf-8'), feed.content_type
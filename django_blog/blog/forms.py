@@ -1,7 +1,7 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
-from .models import Post, Comment
+from .models import Post, Comment, MAX_THREAD_DEPTH
 from taggit.forms import TagWidget
 
 class CustomUserCreationForm(UserCreationForm):
@@ -22,7 +22,23 @@ class PostForm(forms.ModelForm):
 class CommentForm(forms.ModelForm):
     class Meta:
         model = Comment
-        fields = ['content']
+        fields = ['content', 'parent']
         widgets = {
-            'content': forms.Textarea(attrs={'rows': 3, 'placeholder': 'Write your comment...'})
+            'content': forms.Textarea(attrs={'rows': 3, 'placeholder': 'Write your comment...'}),
+            'parent': forms.HiddenInput(),  # set by the "Reply" forms of a thread
         }
+
+    def clean_parent(self):
+        parent = self.cleaned_data.get('parent')
+        if parent and parent.depth + 1 >= MAX_THREAD_DEPTH:
+            raise forms.ValidationError("This thread is too deep to reply to.")
+        return parent
+
+
+class CommentEditForm(forms.ModelForm):
+    # Edits change the text only; moving a comment would leave its path (and its
+    # replies' paths) pointing at the old parent
+    class Meta:
+        model = Comment
+        fields = ['content']
+        widgets = CommentForm.Meta.widgets
@@ -0,0 +1,117 @@
+import functools
+import keyword
+import operator
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models.query import ValuesListIterable
+
+# --------------------------
+# Lite rows
+# --------------------------
+# Read-only stand-ins for model instances on large read paths. A lite row is built
+# straight from a values_list() tuple into a __slots__ class: no Model.__init__, no
+# field descriptors, no _state and no post_init signal. Related lookups become nested
+# rows ("author__name" -> row.author.name), so templates and serializers read them
+# like instances. Models can list methods that are safe to call on a row (methods
+# that only read selected fields) in `lite_methods`.
+
+
+class LiteRow:
+    __slots__ = ()
+    _fields = ()
+    _model = None
+
+    def __repr__(self):
+        values = ', '.join(f'{name}={getattr(self, name)!r}' for name in self._fields)
+        return f'<{type(self).__name__}: {values}>'
+
+
+def _make_init(names):
+    # Positional __init__ assigning each slot, generated like namedtuple's __new__
+    for name in names:
+        if not name.isidentifier() or keyword.iskeyword(name):
+            raise ValueError(f"{name!r} can't be a lite row attribute.")
+    body = ''.join(f'\n    _row.{name} = {name}' for name in names) or '\n    pass'
+    namespace = {}
+    exec(f"def __init__(_row, {', '.join(names)}):{body}", namespace)
+    return namespace['__init__']
+
+
+def _related_model(model, name):
+    if model is None:
+        return None
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+    return field.related_model if field.is_relation else None
+
+
+def _row_builder(model, class_name, paths, nullable):
+    # paths: ((name parts, index in the values tuple), ...)
+    leaves, nested = {}, {}
+    for parts, index in paths:
+        if len(parts) == 1:
+            leaves[parts[0]] = index
+        else:
+            nested.setdefault(parts[0], []).append((parts[1:], index))
+    clash = sorted(leaves.keys() & nested.keys())
+    if clash:
+        raise ValueError(f"{clash[0]!r} is selected both as a value and as a relation.")
+
+    names = (*leaves, *nested)
+    attrs = {'__slots__': names, '__init__': _make_init(names), '_fields': names, '_model': model}
+    if model is not None:
+        if model._meta.pk.attname in leaves and 'pk' not in names:
+            attrs['pk'] = property(operator.attrgetter(model._meta.pk.attname))
+        for method in getattr(model, 'lite_methods', ()):
+            attrs[method] = getattr(model, method)
+    row_class = type(class_name, (LiteRow,), attrs)
+
+    getters = [*leaves.values()] + [
+        _row_builder(_related_model(model, name), f'{class_name}_{name}', sub_paths, nullable=True)
+        for name, sub_paths in nested.items()
+    ]
+    if not nested and not nullable and getters == list(range(len(getters))):
+        return lambda values: row_class(*values)
+
+    def build(values):
+        row_values = [values[getter] if getter.__class__ is int else getter(values) for getter in getters]
+        # A null foreign key reads as None rather than as a row of Nones
+        if nullable and all(value is None for value in row_values):
+            return None
+        return row_class(*row_values)
+    return build
+
+
+@functools.lru_cache(maxsize=None)
+def row_builder(model, names):
+    """Function turning values_list() tuples with these field names into lite rows."""
+    name = f'{model.__name__}Row' if model is not None else 'Row'
+    paths = tuple((tuple(field.split('__')), index) for index, field in enumerate(names))
+    return _row_builder(model, name, paths, nullable=False)
+
+
+class LiteRowIterable(ValuesListIterable):
+    def __iter__(self):
+        queryset = self.queryset
+        query = queryset.query
+        names = queryset._fields or (*query.extra_select, *query.values_select, *query.annotation_select)
+        build = row_builder(queryset.model, tuple(names))
+        for values in super().__iter__():
+            yield build(values)
+
+
+class LiteQuerySet(models.QuerySet):
+    def lite(self, *fields):
+        """
+        Like values_list(*fields), but yielding read-only __slots__ rows with one
+        attribute per field. Without fields, every concrete column is loaded.
+        """
+        if not fields:
+            fields = [field.attname for field in self.model._meta.concrete_fields]
+        clone = self.values_list(*fields)
+        clone._iterable_class = LiteRowIterable
+        return clone
+
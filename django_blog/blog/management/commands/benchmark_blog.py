@@ -0,0 +1,60 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.conf import settings
+
+from blog import benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database with posts, tags and comments, drive the blog views "
+        "through the test client and write latency percentiles, query counts and peak memory "
+        "to a JSON report. With --baseline, fail when the report regresses against it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--tags', type=int, default=500)
+        parser.add_argument('--comments', type=int, default=50000)
+        parser.add_argument('--requests', type=int, default=20, help="Measured requests per view.")
+        parser.add_argument('--only', nargs='*', help="Scenario names to run (default: all).")
+        parser.add_argument('--output', default='benchmark_blog.json', help="Where to write the report.")
+        parser.add_argument('--baseline', help="Report to compare against; regressions fail the command.")
+        parser.add_argument('--tolerance', type=float, default=0.1,
+                            help="Allowed relative growth of latency and memory (default 0.1 = 10%%).")
+        parser.add_argument('--keepdb', action='store_true',
+                            help="Keep the benchmark database (and its data) between runs.")
+
+    def handle(self, *args, **options):
+        # Never seed the development database: work in the test database instead
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+        try:
+            if not benchmarks.Post.objects.exists():
+                self.stdout.write("Seeding...")
+                counts = benchmarks.seed(options['posts'], options['tags'], options['comments'])
+                self.stdout.write(f"Seeded {counts}")
+            with override_settings(DEBUG=False, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                report = benchmarks.run(requests=options['requests'], only=options['only'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+
+        with open(options['output'], 'w') as handle:
+            json.dump(report, handle, indent=2)
+
+        for name, result in report['results'].items():
+            self.stdout.write(
+                f"{name:<14} p50 {result['p50_ms']:>9.1f} ms  p95 {result['p95_ms']:>9.1f} ms  "
+                f"queries {result['queries_max']:>4}  peak {result['peak_memory_kb']:>9.1f} KiB"
+            )
+        self.stdout.write(f"Report written to {options['output']}")
+
+        if options['baseline']:
+            regressions = benchmarks.compare(
+                report, benchmarks.load_report(options['baseline']), options['tolerance']
+            )
+            if regressions:
+                raise CommandError("Performance regressions:\n" + "\n".join(regressions))
+            self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def path_segment(pk):
+    # blog.models._path_segment as of this migration: the id in base 36, zero-padded
+    # to 8 characters, then '/'
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    segment = ''
+    while pk:
+        pk, remainder = divmod(pk, 36)
+        segment = digits[remainder] + segment
+    return segment.rjust(8, '0') + '/'
+
+
+def set_root_paths(apps, schema_editor):
+    # Comments written before threading are all top-level replies to their post
+    Comment = apps.get_model('blog', 'Comment')
+    comments = list(Comment.objects.filter(path=''))
+    for comment in comments:
+        comment.path = path_segment(comment.pk)
+    Comment.objects.bulk_update(comments, ['path'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_post_tags'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='comment',
+            options={'ordering': ['path']},
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='replies', to='blog.comment'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='path',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', 'path'], name='blog_commen_post_id_34d25d_idx'),
+        ),
+        migrations.RunPython(set_root_paths, migrations.RunPython.noop),
+    ]
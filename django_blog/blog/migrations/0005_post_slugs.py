@@ -0,0 +1,51 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def fill_slugs(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    taken = set()
+    posts = list(Post.objects.order_by('pk'))
+    for post in posts:
+        base = slugify(post.title)[:200] or 'post'
+        if base.isdigit() or base == 'new':
+            base = f'post-{base}'
+        slug, number = base, 1
+        while slug in taken:
+            number += 1
+            slug = f'{base}-{number}'
+        taken.add(slug)
+        post.slug = slug
+    Post.objects.bulk_update(posts, ['slug'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_comment_threads'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='slug',
+            field=models.SlugField(default='', editable=False, max_length=220),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='post',
+            name='slug',
+            field=models.SlugField(editable=False, max_length=220, unique=True),
+        ),
+        migrations.CreateModel(
+            name='PostSlugRedirect',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('old_slug', models.SlugField(max_length=220, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slug_redirects', to='blog.post')),
+            ],
+        ),
+    ]
@@ -1,29 +1,167 @@
+import functools
+import re
+
+from django.core.cache import cache
+from django.core.signals import setting_changed
 from django.db import models
 from django.contrib.auth.models import User
+from django.dispatch import receiver
+from django.urls import reverse
+from django.utils.text import slugify
 from taggit.managers import TaggableManager
 
+from .lite import LiteQuerySet
+
+# Slugs that would clash with other routes under posts/
+RESERVED_SLUGS = {'new'}
+SLUG_PLACEHOLDER = 'post-slug'
+
+@functools.lru_cache(maxsize=None)
+def _post_url_parts():
+    # reverse() runs once per process; every post URL is then a string concatenation
+    return reverse('post-detail', kwargs={'slug': SLUG_PLACEHOLDER}).split(SLUG_PLACEHOLDER)
+
+@receiver(setting_changed)
+def _clear_post_url_parts(setting, **kwargs):
+    if setting == 'ROOT_URLCONF':
+        _post_url_parts.cache_clear()
+
 # Blog post model
 class Post(models.Model):
     title = models.CharField(max_length=200)
+    slug = models.SlugField(max_length=220, unique=True, editable=False)
     content = models.TextField()
     published_date = models.DateTimeField(auto_now_add=True)
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     tags = TaggableManager(blank=True)  # Tagging functionality
 
+    objects = LiteQuerySet.as_manager()
+    # Methods lite rows of posts borrow; they only read title and slug
+    lite_methods = ('__str__', 'get_absolute_url')
+
     def __str__(self):
         return self.title
 
     def get_absolute_url(self):
-        from django.urls import reverse
-        return reverse('post-detail', kwargs={'pk': self.pk})
+        prefix, suffix = _post_url_parts()
+        return f'{prefix}{self.slug}{suffix}'
+
+    def _slug_base(self):
+        base = slugify(self.title)[:200] or 'post'
+        # All-digit slugs would be taken for a pk by the posts/<int:pk>/ route
+        if base.isdigit() or base in RESERVED_SLUGS:
+            base = f'post-{base}'
+        return base
+
+    def _unique_slug(self, base):
+        slug, number = base, 1
+        while Post.objects.filter(slug=slug).exclude(pk=self.pk).exists():
+            number += 1
+            slug = f'{base}-{number}'
+        return slug
+
+    def save(self, *args, **kwargs):
+        base = self._slug_base()
+        # Keep the slug (and its -N suffix) while the title still produces it
+        if not re.fullmatch(rf'{re.escape(base)}(-\d+)?', self.slug):
+            old_slug = self.slug
+            self.slug = self._unique_slug(base)
+            if old_slug and self.pk:
+                PostSlugRedirect.objects.filter(old_slug=self.slug).delete()
+                PostSlugRedirect.objects.update_or_create(old_slug=old_slug, defaults={'post': self})
+                PostSlugRedirect.clear_cache(self)
+        super().save(*args, **kwargs)
+
+# Old slugs of renamed posts, so that published links keep working
+class PostSlugRedirect(models.Model):
+    old_slug = models.SlugField(max_length=220, unique=True)
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='slug_redirects')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.old_slug} -> {self.post.slug}'
+
+    @staticmethod
+    def _cache_key(slug):
+        return f'blog:slug-redirect:{slug}'
+
+    @classmethod
+    def target_slug(cls, old_slug):
+        """
+        Current slug for an old slug, or None. Only real redirects are cached, so
+        probed and mistyped slugs can't fill the cache.
+        """
+        key = cls._cache_key(old_slug)
+        target = cache.get(key)
+        if target is None:
+            target = cls.objects.filter(old_slug=old_slug).values_list('post__slug', flat=True).first()
+            if target is not None:
+                cache.set(key, target, None)
+        return target
+
+    @classmethod
+    def clear_cache(cls, post):
+        old_slugs = cls.objects.filter(post=post).values_list('old_slug', flat=True)
+        cache.delete_many([cls._cache_key(slug) for slug in [*old_slugs, post.slug]])
+
+@receiver(models.signals.pre_delete, sender=Post)
+def _clear_deleted_post_redirects(sender, instance, **kwargs):
+    PostSlugRedirect.clear_cache(instance)
+
+# Threaded comments use a materialized path: every comment stores the ids of its
+# ancestors and itself as fixed-width base36 segments ("0000001a/0000001f/"), so
+# ordering by path lists a thread depth-first and a subtree is one range scan.
+PATH_SEGMENT_WIDTH = 8
+PATH_SEGMENT_LENGTH = PATH_SEGMENT_WIDTH + 1
+MAX_THREAD_DEPTH = 25  # 25 segments of 9 chars fit in the 255 chars of Comment.path
+
+def _path_segment(pk):
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    segment = ''
+    while pk:
+        pk, remainder = divmod(pk, 36)
+        segment = digits[remainder] + segment
+    return segment.rjust(PATH_SEGMENT_WIDTH, '0') + '/'
+
+class CommentQuerySet(models.QuerySet):
+    def thread(self, post):
+        # Whole discussion of a post, depth-first, in one query
+        return self.filter(post=post).select_related('author').order_by('path')
+
+    def subtree(self, comment):
+        # A comment and all its replies; '~' sorts after every character used in paths,
+        # so this is an index range scan instead of a LIKE
+        return self.filter(
+            post_id=comment.post_id, path__gte=comment.path, path__lt=comment.path + '~'
+        ).select_related('author').order_by('path')
 
 # Comment model
 class Comment(models.Model):
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='comments')
     author = models.ForeignKey(User, on_delete=models.CASCADE)
+    parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='replies')
+    path = models.CharField(max_length=255, blank=True, editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CommentQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['path']
+        indexes = [
+            models.Index(fields=['post', 'path']),
+        ]
+
     def __str__(self):
         return f'Comment by {self.author.username} on {self.post.title}'
+
+    def save(self, *args, **kwargs):
+        if self.parent_id:
+            self.depth = self.parent.depth + 1
+        super().save(*args, **kwargs)
+        # The path ends with our own id, which is only known after the insert
+        if not self.path:
+            self.path = (self.parent.path if self.parent_id else '') + _path_segment(self.pk)
+            Comment.objects.filter(pk=self.pk).update(path=self.path)
@@ -1,3 +1,275 @@
 from django.test import TestCase
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from .models import Post, Comment, PostSlugRedirect
+from . import benchmarks, feeds
 
-# Create your tests here.
+
+class PostFeedTestCase(TestCase):
+    """
+    Tests for the RSS/Atom/JSON feeds and their conditional GET support.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='writer', password='testpass123')
+        self.post = Post.objects.create(title='First post', content='Hello', author=self.author)
+        self.post.tags.add('django')
+
+    def test_feed_formats(self):
+        """
+        Test that every format renders the posts of the feed.
+        """
+        for fmt, content_type in [('rss', 'application/rss+xml'),
+                                  ('atom', 'application/atom+xml'),
+                                  ('json', 'application/feed+json')]:
+            response = self.client.get(reverse('post-feed', args=[fmt]))
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response['Content-Type'].startswith(content_type))
+            self.assertContains(response, 'First post')
+
+    def test_unknown_format_not_found(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('post-feed', args=['yaml']))
+        self.assertEqual(response.status_code, 404)
+
+    def test_unknown_tag_or_author_not_cached(self):
+        for url in (reverse('tag-feed', args=['nope', 'rss']), reverse('author-feed', args=['nobody', 'rss'])):
+            self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertIsNone(cache.get(feeds._snapshot_key('tag', 'nope')))
+        self.assertIsNone(cache.get(feeds._snapshot_key('author', 'nobody')))
+
+    def test_repeat_poll_is_not_modified_without_queries(self):
+        """
+        Test that a poll with the previous ETag gets a 304 straight from the cache.
+        """
+        response = self.client.get(reverse('post-feed', args=['rss']))
+        self.assertIn('Last-Modified', response)
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                reverse('post-feed', args=['rss']), HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        self.assertEqual(response.status_code, 304)
+
+    def test_new_post_updates_feed(self):
+        """
+        Test that saving a post patches the cached snapshot and changes the ETag.
+        """
+        etag = self.client.get(reverse('post-feed', args=['json']))['ETag']
+        Post.objects.create(title='Second post', content='Again', author=self.author)
+        response = self.client.get(reverse('post-feed', args=['json']), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['title'] for item in response.json()['items']],
+                         ['Second post', 'First post'])
+
+    def test_tag_and_author_feeds(self):
+        """
+        Test the per-tag and per-author feeds, including tag changes after caching.
+        """
+        response = self.client.get(reverse('tag-feed', args=['python', 'json']))
+        self.assertEqual(response.status_code, 404)
+
+        self.post.tags.add('python')
+        response = self.client.get(reverse('tag-feed', args=['python', 'json']))
+        self.assertEqual(len(response.json()['items']), 1)
+
+        response = self.client.get(reverse('author-feed', args=['writer', 'atom']))
+        self.assertContains(response, 'First post')
+
+    def test_deleted_post_leaves_feed(self):
+        self.client.get(reverse('post-feed', args=['json']))
+        self.post.delete()
+        response = self.client.get(reverse('post-feed', args=['json']))
+        self.assertEqual(response.json()['items'], [])
+
+
+class CommentThreadTestCase(TestCase):
+    """
+    Tests for threaded comments stored with materialized paths.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader', password='testpass123')
+        self.post = Post.objects.create(title='Threads', content='Discuss', author=self.user)
+        self.first = Comment.objects.create(post=self.post, author=self.user, content='first')
+        self.second = Comment.objects.create(post=self.post, author=self.user, content='second')
+        self.reply = Comment.objects.create(post=self.post, author=self.user, content='reply', parent=self.first)
+        self.nested = Comment.objects.create(post=self.post, author=self.user, content='nested', parent=self.reply)
+
+    def test_path_and_depth(self):
+        self.nested.refresh_from_db()
+        self.assertEqual(self.nested.depth, 2)
+        self.assertTrue(self.nested.path.startswith(self.reply.path))
+        self.assertTrue(self.reply.path.startswith(self.first.path))
+
+    def test_thread_is_depth_first_in_one_query(self):
+        with self.assertNumQueries(1):
+            contents = [c.content for c in Comment.objects.thread(self.post)]
+        self.assertEqual(contents, ['first', 'reply', 'nested', 'second'])
+
+    def test_subtree(self):
+        contents = [c.content for c in Comment.objects.subtree(self.first)]
+        self.assertEqual(contents, ['first', 'reply', 'nested'])
+
+    def test_reply_through_view(self):
+        """
+        Test that CommentCreateView attaches a reply to its parent comment.
+        """
+        self.client.force_login(self.user)
+        response = self.client.post(
+            reverse('comment-create', args=[self.post.pk]),
+            {'content': 'answer', 'parent': self.second.pk},
+        )
+        self.assertEqual(response.status_code, 302)
+        answer = Comment.objects.get(content='answer')
+        self.assertEqual(answer.parent, self.second)
+        self.assertEqual(answer.depth, 1)
+
+    def test_reply_to_other_post_rejected(self):
+        other = Post.objects.create(title='Other', content='x', author=self.user)
+        self.client.force_login(self.user)
+        response = self.client.post(
+            reverse('comment-create', args=[other.pk]),
+            {'content': 'answer', 'parent': self.first.pk},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Comment.objects.filter(content='answer').exists())
+
+    def test_edit_keeps_thread_position(self):
+        self.client.force_login(self.user)
+        path = Comment.objects.get(pk=self.reply.pk).path
+        response = self.client.post(
+            reverse('comment-update', args=[self.post.pk, self.reply.pk]),
+            {'content': 'edited', 'parent': self.second.pk},
+        )
+        self.assertEqual(response.status_code, 302)
+        self.reply.refresh_from_db()
+        self.assertEqual((self.reply.content, self.reply.parent, self.reply.path), ('edited', self.first, path))
+        self.assertEqual([c.content for c in Comment.objects.thread(self.post)], ['first', 'edited', 'nested', 'second'])
+
+    def test_open_thread_expands_deep_subtree(self):
+        """
+        Test that following "open thread" on a deep comment shows its replies expanded.
+        """
+        parent = self.nested
+        for depth in range(3, 6):
+            parent = Comment.objects.create(post=self.post, author=self.user, content=f'depth {depth}', parent=parent)
+        deep = Comment.objects.get(content='depth 3')
+
+        response = self.client.get(self.post.get_absolute_url())
+        self.assertContains(response, f'?thread={deep.pk}')
+        self.assertContains(response, '<details>')
+
+        response = self.client.get(self.post.get_absolute_url(), {'thread': deep.pk})
+        self.assertContains(response, 'depth 5')
+        self.assertNotContains(response, '<details>')
+        self.assertNotContains(response, '?thread=')
+
+    def test_detail_renders_thread(self):
+        response = self.client.get(self.post.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([c.content for c in response.context['comments']], ['first', 'second'])
+        self.assertContains(response, 'nested')
+
+        response = self.client.get(self.post.get_absolute_url(), {'thread': self.reply.pk})
+        self.assertEqual([c.content for c in response.context['comments']], ['reply'])
+        self.assertNotContains(response, 'second')
+
+
+class BenchmarkHarnessTestCase(TestCase):
+    """
+    Smoke test for the benchmark harness at a tiny scale.
+    """
+
+    def test_seed_run_and_compare(self):
+        counts = benchmarks.seed(posts=20, tags=5, comments=30)
+        self.assertEqual(Post.objects.count(), counts['posts'])
+        self.assertEqual(Comment.objects.count(), counts['comments'])
+
+        report = benchmarks.run(requests=2)
+        self.assertEqual(set(report['results']),
+                         {'home', 'post_list', 'post_detail', 'search_posts', 'posts_by_tag'})
+        self.assertEqual(benchmarks.compare(report, report), [])
+
+        slower = {'results': {'home': dict(report['results']['home'], queries_max=0)}}
+        self.assertEqual(len(benchmarks.compare(report, slower)), 1)
+
+
+class PostSlugTestCase(TestCase):
+    """
+    Tests for slug-based post URLs and redirects of renamed posts.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='writer', password='testpass123')
+        self.post = Post.objects.create(title='Hello World', content='x', author=self.user)
+
+    def test_unique_slugs(self):
+        other = Post.objects.create(title='Hello world!', content='y', author=self.user)
+        self.assertEqual(self.post.slug, 'hello-world')
+        self.assertEqual(other.slug, 'hello-world-2')
+        self.assertEqual(other.get_absolute_url(), '/posts/hello-world-2/')
+
+    def test_slugs_never_clash_with_other_routes(self):
+        self.assertEqual(Post.objects.create(title='1984', content='x', author=self.user).slug, 'post-1984')
+        self.assertEqual(Post.objects.create(title='New', content='x', author=self.user).slug, 'post-new')
+
+    def test_slug_kept_when_title_still_matches(self):
+        other = Post.objects.create(title='Hello World', content='y', author=self.user)
+        other.content = 'edited'
+        other.save()
+        self.assertEqual(other.slug, 'hello-world-2')
+
+    def test_renamed_post_redirects_from_old_slug(self):
+        old_url = self.post.get_absolute_url()
+        self.assertEqual(self.client.get(old_url).status_code, 200)
+
+        self.post.title = 'Goodbye World'
+        self.post.save()
+        response = self.client.get(old_url)
+        self.assertRedirects(response, '/posts/goodbye-world/', status_code=301)
+
+        # The redirect target is served from the cache on repeat hits
+        with self.assertNumQueries(1):
+            self.client.get(old_url)
+
+        # Renaming back makes the old slug live again
+        self.post.title = 'Hello World'
+        self.post.save()
+        self.assertEqual(self.client.get(old_url).status_code, 200)
+        self.assertRedirects(self.client.get('/posts/goodbye-world/'), old_url, status_code=301)
+
+    def test_pk_urls_redirect_to_slug(self):
+        response = self.client.get(reverse('post-detail-pk', args=[self.post.pk]))
+        self.assertRedirects(response, self.post.get_absolute_url(), status_code=301)
+
+    def test_unknown_slug_not_found(self):
+        self.assertEqual(self.client.get('/posts/missing/').status_code, 404)
+        self.assertIsNone(cache.get(PostSlugRedirect._cache_key('missing')))
+
+
+class LiteRowTestCase(TestCase):
+    """
+    Tests for the lite rows behind the home page.
+    """
+
+    def setUp(self):
+        self.authors = [User.objects.create_user(username=f'writer{i}', password='testpass123') for i in range(3)]
+        for i, author in enumerate(self.authors):
+            Post.objects.create(title=f'Post {i}', content='Body', author=author)
+
+    def test_rows_read_like_posts(self):
+        row = Post.objects.lite('id', 'title', 'slug', 'author__username').get(title='Post 1')
+        post = Post.objects.get(title='Post 1')
+        self.assertEqual((row.pk, str(row), row.get_absolute_url()), (post.pk, str(post), post.get_absolute_url()))
+        self.assertEqual(row.author.username, 'writer1')
+        self.assertFalse(hasattr(row, '__dict__'))
+
+    def test_home_lists_posts_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('home'))
+        for i, author in enumerate(self.authors):
+            self.assertContains(response, f'By {author.username}')
+            self.assertContains(response, Post.objects.get(title=f'Post {i}').get_absolute_url())
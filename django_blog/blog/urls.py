@@ -14,7 +14,8 @@ urlpatterns = [
     # Blog Posts CRUD
     path('posts/', views.PostListView.as_view(), name='post-list'),
     path('posts/new/', views.PostCreateView.as_view(), name='post-create'),
-    path('posts/<int:pk>/', views.PostDetailView.as_view(), name='post-detail'),
+    path('posts/<int:pk>/', views.post_detail_by_pk, name='post-detail-pk'),  # pre-slug links
+    path('posts/<slug:slug>/', views.PostDetailView.as_view(), name='post-detail'),
     path('posts/<int:pk>/edit/', views.PostUpdateView.as_view(), name='post-update'),
     path('posts/<int:pk>/delete/', views.PostDeleteView.as_view(), name='post-delete'),
 
@@ -28,4 +29,9 @@ urlpatterns = [
 
     # Search
     path('search/', views.search_posts, name='search-posts'),
+
+    # Feeds (fmt is one of rss, atom, json)
+    path('feeds/<str:fmt>/', views.post_feed, name='post-feed'),
+    path('tags/<str:tag>/feed/<str:fmt>/', views.post_feed, name='tag-feed'),
+    path('authors/<str:username>/feed/<str:fmt>/', views.post_feed, name='author-feed'),
 ]
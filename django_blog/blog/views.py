@@ -3,18 +3,26 @@ from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.db.models import Q
-from .forms import CustomUserCreationForm, PostForm, CommentForm
-from .models import Post, Comment
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import condition
+from .forms import CustomUserCreationForm, PostForm, CommentForm, CommentEditForm
+from .models import Post, Comment, PostSlugRedirect, MAX_THREAD_DEPTH
+from .feeds import FEED_FORMATS, get_snapshot, render_feed
 from django.contrib.auth.forms import AuthenticationForm
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.urls import reverse_lazy
+from django_blog.budgets import budget
 
 # --------------------------
 # Home view
 # --------------------------
+@budget(queries=1, ms=100, url='/')
 def home(request):
-    posts = Post.objects.all().order_by('-published_date')
+    # Read-only listing: lite rows with the author's name joined in, not Post instances
+    posts = Post.objects.lite(
+        'id', 'title', 'slug', 'content', 'published_date', 'author__username'
+    ).order_by('-published_date')
     return render(request, 'blog/index.html', {'posts': posts})
 
 # --------------------------
@@ -65,22 +73,74 @@ def profile_view(request):
 # --------------------------
 # Post CRUD Views
 # --------------------------
+@budget(queries=1, ms=100, url='/posts/')
 class PostListView(ListView):
-    model = Post
+    queryset = Post.objects.select_related('author')
     template_name = 'blog/post_list.html'
     context_object_name = 'posts'
     ordering = ['-published_date']
 
+# Replies below this depth are folded away in the thread template
+COMMENT_COLLAPSE_DEPTH = 3
+
+def _comment_tree(comments):
+    # `comments` is ordered by path, so every parent comes before its replies
+    nodes = {}
+    roots = []
+    for comment in comments:
+        comment.children = []
+        comment.descendant_count = 0
+        nodes[comment.pk] = comment
+        parent = nodes.get(comment.parent_id)
+        if parent is None:
+            roots.append(comment)
+        else:
+            parent.children.append(comment)
+    for comment in reversed(list(nodes.values())):
+        parent = nodes.get(comment.parent_id)
+        if parent is not None:
+            parent.descendant_count += comment.descendant_count + 1
+    return roots
+
+@budget(queries=4, ms=30, url=lambda fixtures: fixtures['post'].get_absolute_url())
 class PostDetailView(DetailView):
-    model = Post
+    queryset = Post.objects.select_related('author')
     template_name = 'blog/post_detail.html'
     context_object_name = 'post'
 
+    def get(self, request, *args, **kwargs):
+        try:
+            return super().get(request, *args, **kwargs)
+        except Http404:
+            # Renamed posts keep answering on their old slugs
+            target = PostSlugRedirect.target_slug(kwargs['slug'])
+            if target is None:
+                raise
+            return redirect('post-detail', slug=target, permanent=True)
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['comment_form'] = CommentForm()
+        # ?thread=<comment id> shows only that comment and its replies
+        thread = self.request.GET.get('thread')
+        if thread and thread.isdigit():
+            root = get_object_or_404(Comment, pk=thread, post=self.object)
+            comments = Comment.objects.subtree(root)
+            context['thread_root'] = root
+            base_depth = root.depth
+        else:
+            comments = Comment.objects.thread(self.object)
+            base_depth = 0
+        context['comments'] = _comment_tree(comments)
+        # Subtrees collapse by their depth below the comment the page starts from
+        context['collapse_depth'] = base_depth + COMMENT_COLLAPSE_DEPTH
+        context['max_reply_depth'] = MAX_THREAD_DEPTH - 1
         return context
 
+def post_detail_by_pk(request, pk):
+    slug = get_object_or_404(Post.objects.only('slug'), pk=pk).slug
+    return redirect('post-detail', slug=slug, permanent=True)
+
 class PostCreateView(LoginRequiredMixin, CreateView):
     model = Post
     form_class = PostForm
@@ -121,6 +181,12 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
     form_class = CommentForm
     template_name = 'blog/comment_form.html'
 
+    def get_form(self, form_class=None):
+        form = super().get_form(form_class)
+        # Replies can only attach to comments of the same post
+        form.fields['parent'].queryset = Comment.objects.filter(post_id=self.kwargs['post_pk'])
+        return form
+
     def form_valid(self, form):
         post_pk = self.kwargs['post_pk']
         post = get_object_or_404(Post, pk=post_pk)
@@ -134,7 +200,7 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
 
 class CommentUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
     model = Comment
-    form_class = CommentForm
+    form_class = CommentEditForm
     template_name = 'blog/comment_form.html'
 
     def test_func(self):
@@ -165,13 +231,49 @@ class CommentDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
 # --------------------------
 # Tagging and Search Views
 # --------------------------
+@budget(queries=1, ms=30, url=lambda fixtures: f"/tags/{fixtures['tag']}/")
 def posts_by_tag(request, tag):
-    posts = Post.objects.filter(tags__name__in=[tag]).order_by('-published_date')
+    posts = Post.objects.filter(tags__name__in=[tag]).select_related('author').order_by('-published_date')
     return render(request, 'blog/post_list.html', {'posts': posts, 'tag': tag})
 
+@budget(queries=1, ms=30, url=lambda fixtures: f"/search/?q={fixtures['tag']}")
 def search_posts(request):
     query = request.GET.get('q')
     posts = Post.objects.filter(
         Q(title__icontains=query) | Q(content__icontains=query) | Q(tags__name__icontains=query)
-    ).distinct().order_by('-published_date')
+    ).distinct().select_related('author').order_by('-published_date')
     return render(request, 'blog/post_list.html', {'posts': posts, 'query': query})
+
+
+# --------------------------
+# Feed Views
+# --------------------------
+def _feed_scope(tag=None, username=None):
+    if tag is not None:
+        return 'tag', tag
+    if username is not None:
+        return 'author', username
+    return 'all', None
+
+def _feed_etag(request, fmt, snapshot, *scope):
+    return f'{fmt}-{snapshot["etag"]}'
+
+def _feed_last_modified(request, fmt, snapshot, *scope):
+    return snapshot['updated']
+
+# Repeat polls are answered with 304 from the cached snapshot, without any query
+@condition(etag_func=_feed_etag, last_modified_func=_feed_last_modified)
+def _feed_response(request, fmt, snapshot, kind, value):
+    content, content_type = render_feed(request, fmt, snapshot, kind, value)
+    return HttpResponse(content, content_type=content_type)
+
+# The format and the tag or author are checked before any snapshot is read or built
+@budget(queries=1, ms=30, url='/feeds/rss/')
+def post_feed(request, fmt, tag=None, username=None):
+    if fmt not in FEED_FORMATS:
+        raise Http404("Unknown feed format.")
+    kind, value = _feed_scope(tag, username)
+    snapshot = get_snapshot(kind, value)
+    if snapshot is None:
+        raise Http404("No such feed.")
+    return _feed_response(request, fmt, snapshot, kind, value)
@@ -0,0 +1 @@
+../../django_perf/database.py
\ No newline at end of file
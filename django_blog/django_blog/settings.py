@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from .database import database_settings
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -36,13 +39,16 @@ INSTALLED_APPS = [
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
+    'whitenoise.runserver_nostatic',  # let WhiteNoise serve static files under runserver too
     'django.contrib.staticfiles',
     'blog',
     'taggit',
 ]
 
 MIDDLEWARE = [
+    'django_blog.database.DatabaseMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',  # serves static files straight from the app container
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -74,10 +80,25 @@ WSGI_APPLICATION = 'django_blog.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# DATABASE_PROFILE=dev (SQLite, the default), persistent or pooled (PostgreSQL at
+# DATABASE_URL); see django_blog/database.py for the pool and lifetime knobs
 DATABASES = {
+    'default': database_settings(BASE_DIR),
+}
+
+# Seconds between the connection and pool metrics DatabaseMetricsMiddleware logs
+DATABASE_METRICS_INTERVAL = 60
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Feed snapshots live here. Use a shared backend (Redis/Memcached) when running more
+# than one process so that writes invalidate the snapshots every process reads.
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'django-blog',
     }
 }
 
@@ -120,9 +141,39 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [
     BASE_DIR / 'blog' / 'static',
 ]
+STATIC_ROOT = BASE_DIR / 'staticfiles'  # output of `python manage.py collectstatic`
+
+# In production collectstatic writes content-hashed copies (styles.<hash>.css) plus a
+# manifest, and pre-builds .gz and .br variants (brotli needs the `Brotli` package).
+# WhiteNoise serves hashed files with `Cache-Control: max-age=315360000, immutable`.
+# While developing (and in tests) files are served unhashed, so collectstatic is not needed.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+            else 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+        ),
+    },
+}
+
+# Cache lifetime for static files that are not hashed; hashed files are cached forever.
+WHITENOISE_MAX_AGE = 0 if DEBUG else 3600
 
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Performance budgets declared on the views with @budget; see django_blog/budgets.py
+TEST_RUNNER = 'django_blog.budgets.BudgetTestRunner'
+BUDGET_SEED = 'blog.budgets.seed'
+BUDGET_CLIENT = 'django.test.Client'
+BUDGET_REPEAT = 5
+BUDGET_HISTORY = BASE_DIR / 'budget_history.jsonl'
+# Scales every latency budget, for machines slower than the ones budgets were set
+# on; CI runners (CI set) default to 3
+BUDGET_LATENCY_FACTOR = float(os.environ.get('BUDGET_LATENCY_FACTOR', 3 if os.environ.get('CI') else 1))
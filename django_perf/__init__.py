@@ -0,0 +1,16 @@
+"""
+Performance tooling shared by the Django projects of this repository: database
+profiles and metrics (database.py, sqlite_wal), performance budgets (budgets.py)
+and their budget_report command.
+
+The projects are run from their own directories, so this directory isn't on
+their import path. Each project links the modules it uses into its own packages
+instead, and imports them from there:
+
+    <project package>/database.py        -> django_perf/database.py
+    <project package>/sqlite_wal         -> django_perf/sqlite_wal
+    <project package>/budgets.py         -> django_perf/budgets.py
+    <app>/management/commands/budget_report.py -> django_perf/budget_report.py
+
+Edit the modules here; the links are relative, so they work from any checkout.
+"""
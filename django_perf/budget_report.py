@@ -0,0 +1,34 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+def budgets_module():
+    # The project's budgets module, the one its TEST_RUNNER comes from
+    return import_module(settings.TEST_RUNNER.rpartition('.')[0])
+
+
+class Command(BaseCommand):
+    help = "Show how the views' query counts and latencies moved over the recorded budget runs."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=10, help="Most recent runs to show.")
+        parser.add_argument('--history', help="History file (defaults to BUDGET_HISTORY).")
+
+    def handle(self, *args, **options):
+        budgets = budgets_module()
+        history = budgets.load_history(options['history'])
+        if not history:
+            self.stdout.write("No budget runs recorded yet; run the test suite first.")
+            return
+        self.stdout.write(f"Last {min(len(history), options['runs'])} of {len(history)} runs, oldest first")
+        for row in budgets.trend_report(history, options['runs']):
+            change = '' if row['change'] is None else f"{row['change']:+.0%}"
+            line = (
+                f"{row['view']:<22} budget {row['budget_queries']:>3} q {row['budget_ms']:>6g} ms | "
+                f"ms {' '.join(f'{ms:.1f}' for ms in row['ms'])} | "
+                f"queries {' '.join(str(queries) for queries in row['queries'])} | {change}"
+            )
+            over = row['queries'][-1] > row['budget_queries'] or row['ms'][-1] > row['budget_ms']
+            self.stdout.write(self.style.ERROR(line) if over else line)
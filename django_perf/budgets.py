@@ -0,0 +1,192 @@
+import json
+import os
+import platform
+import statistics
+import time
+import unittest
+from datetime import datetime, timezone
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.runner import DiscoverRunner
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver
+from django.utils.module_loading import import_string
+
+
+# --------------------------
+# Registry
+# --------------------------
+# View name -> Budget, filled in as the views are imported
+REGISTRY = {}
+
+
+class Budget:
+    def __init__(self, view, queries, ms, url, login):
+        self.name = view.__name__
+        self.queries = queries
+        self.ms = ms
+        self.url = url
+        self.login = login
+
+    def path(self, fixtures):
+        return self.url(fixtures) if callable(self.url) else self.url
+
+
+def budget(queries, ms, url, login=False):
+    """
+    Class or function view decorator declaring how many queries and how many
+    milliseconds (median) a GET of `url` with BUDGET_CLIENT may take against the
+    data BUDGET_SEED creates. `url` is a path, or a function of the seeded
+    fixtures returning one; with login=True the request is made as fixtures['user'].
+    """
+    def register(view):
+        REGISTRY[view.__name__] = Budget(view, queries, ms, url, login)
+        return view
+    return register
+
+
+# --------------------------
+# Checks
+# --------------------------
+class PerformanceBudgetTestCase(TestCase):
+    """
+    Requests every registered view against seeded data and fails when it runs
+    more queries or takes longer than its budget. Response caches are cleared
+    before each timed request, so budgets hold for cold requests.
+    """
+    # View name -> measurements of this run, written to BUDGET_HISTORY by the runner
+    results = {}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.fixtures = import_string(settings.BUDGET_SEED)()
+
+    def measure(self, budget):
+        client = import_string(settings.BUDGET_CLIENT)()
+        if budget.login:
+            # DRF's APIClient skips the authentication classes; Django's Client logs in a session
+            if hasattr(client, 'force_authenticate'):
+                client.force_authenticate(user=self.fixtures['user'])
+            else:
+                client.force_login(self.fixtures['user'])
+        path = budget.path(self.fixtures)
+        client.get(path)  # warm-up: first-request imports and template loading
+        timings, queries = [], 0
+        for _ in range(settings.BUDGET_REPEAT):
+            cache.clear()
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = client.get(path)
+                timings.append((time.perf_counter() - start) * 1000)
+            queries = max(queries, len(captured))
+        return response, queries, statistics.median(timings)
+
+    def check_budget(self, budget):
+        response, queries, ms = self.measure(budget)
+        self.results[budget.name] = {
+            'queries': queries, 'ms': round(ms, 2), 'budget_queries': budget.queries, 'budget_ms': budget.ms,
+        }
+        self.assertEqual(response.status_code, 200, f'{budget.name} answered {response.status_code}.')
+        self.assertLessEqual(queries, budget.queries, f'{budget.name} ran {queries} queries, over its budget.')
+        limit = budget.ms * settings.BUDGET_LATENCY_FACTOR
+        self.assertLessEqual(ms, limit, f'{budget.name} took {ms:.1f} ms, over its budget of {limit:g} ms.')
+
+
+def _budget_test(budget):
+    def test(self):
+        self.check_budget(budget)
+    return test
+
+
+def budget_test_case():
+    """PerformanceBudgetTestCase with a test_<view> method per registered budget."""
+    get_resolver().url_patterns  # importing the URLconf imports the views, which register their budgets
+    tests = {f'test_{name}': _budget_test(budget) for name, budget in sorted(REGISTRY.items())}
+    return type('PerformanceBudgetTestCase', (PerformanceBudgetTestCase,), tests)
+
+
+class BudgetTestRunner(DiscoverRunner):
+    """
+    DiscoverRunner that also checks the performance budgets on full runs (no test
+    labels) and appends the measurements to BUDGET_HISTORY. --budgets runs only
+    the budgets, --skip-budgets leaves them out.
+    """
+
+    def __init__(self, budgets=False, skip_budgets=False, **kwargs):
+        super().__init__(**kwargs)
+        self.budgets = budgets
+        self.skip_budgets = skip_budgets
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--budgets', action='store_true', help="Only check the performance budgets.")
+        parser.add_argument('--skip-budgets', action='store_true', help="Don't check the performance budgets.")
+
+    def build_suite(self, test_labels=None, **kwargs):
+        if self.budgets:
+            suite = self.test_suite()
+        else:
+            suite = super().build_suite(test_labels, **kwargs)
+            if test_labels or self.skip_budgets:
+                return suite
+        suite.addTests(unittest.defaultTestLoader.loadTestsFromTestCase(budget_test_case()))
+        return suite
+
+    def suite_result(self, suite, result, **kwargs):
+        # Measurements of parallel workers stay in their processes
+        if PerformanceBudgetTestCase.results:
+            record_run(PerformanceBudgetTestCase.results)
+        return super().suite_result(suite, result, **kwargs)
+
+
+# --------------------------
+# History
+# --------------------------
+def record_run(results, path=None):
+    entry = {
+        'time': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': os.environ.get('GIT_COMMIT', ''),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'results': results,
+    }
+    with open(path or settings.BUDGET_HISTORY, 'a') as history:
+        history.write(json.dumps(entry) + '\n')
+
+
+def load_history(path=None):
+    try:
+        with open(path or settings.BUDGET_HISTORY) as history:
+            return [json.loads(line) for line in history if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def trend_report(history, runs=10):
+    """
+    Per view, over the last `runs` recorded runs: its current budget, the median
+    milliseconds and query counts of each run, and the change of the last run's
+    milliseconds against the median of the runs before it.
+    """
+    history = history[-runs:]
+    report = []
+    for name in sorted({name for entry in history for name in entry['results']}):
+        measured = [entry['results'][name] for entry in history if name in entry['results']]
+        ms = [result['ms'] for result in measured]
+        change = None
+        if len(ms) > 1 and statistics.median(ms[:-1]):
+            change = ms[-1] / statistics.median(ms[:-1]) - 1
+        report.append({
+            'view': name,
+            'budget_queries': measured[-1]['budget_queries'],
+            'budget_ms': measured[-1]['budget_ms'],
+            'queries': [result['queries'] for result in measured],
+            'ms': ms,
+            'change': change,
+        })
+    return report
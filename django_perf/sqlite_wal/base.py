@@ -0,0 +1,99 @@
+import threading
+from contextlib import contextmanager
+
+from django.db.backends.sqlite3 import base
+from django.db.utils import OperationalError
+
+# Statements that need SQLite's write lock when run outside a transaction
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE', 'REPLAC')
+
+# One lock per database file, shared by all connections of this process
+_write_locks = {}
+_write_locks_guard = threading.Lock()
+
+
+def write_lock(name):
+    with _write_locks_guard:
+        return _write_locks.setdefault(str(name), threading.RLock())
+
+
+class WriteQueueCursorWrapper(base.SQLiteCursorWrapper):
+    def execute(self, query, params=None):
+        if self.db.in_atomic_block or not query.lstrip()[:6].upper().startswith(WRITE_STATEMENTS):
+            return super().execute(query, params)
+        with self.db.holding_write_lock():
+            return super().execute(query, params)
+
+    def executemany(self, query, param_list):
+        if self.db.in_atomic_block:
+            return super().executemany(query, param_list)
+        with self.db.holding_write_lock():
+            return super().executemany(query, param_list)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite backend whose writers queue on a lock of this process instead of
+    racing for the database file's lock and sleeping in SQLite's busy handler.
+    A transaction holds the lock from BEGIN to COMMIT or ROLLBACK (use
+    transaction_mode IMMEDIATE so that it also holds the file's write lock from
+    the start); writes outside transactions hold it for their statement. Other
+    processes still wait on the file lock, up to OPTIONS['timeout'] seconds.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.holds_write_lock = False
+
+    @property
+    def write_lock(self):
+        return write_lock(self.settings_dict['NAME'])
+
+    def acquire_write_lock(self):
+        if not self.write_lock.acquire(timeout=self.settings_dict['OPTIONS'].get('timeout', 5)):
+            raise OperationalError("database is locked (timed out waiting for this process's other writers)")
+
+    @contextmanager
+    def holding_write_lock(self):
+        self.acquire_write_lock()
+        try:
+            yield
+        finally:
+            self.write_lock.release()
+
+    def release_write_lock(self):
+        if self.holds_write_lock:
+            self.holds_write_lock = False
+            self.write_lock.release()
+
+    def create_cursor(self, name=None):
+        cursor = self.connection.cursor(factory=WriteQueueCursorWrapper)
+        cursor.db = self
+        return cursor
+
+    def _start_transaction_under_autocommit(self):
+        self.acquire_write_lock()
+        try:
+            super()._start_transaction_under_autocommit()
+        except BaseException:
+            self.write_lock.release()
+            raise
+        self.holds_write_lock = True
+
+    def _commit(self):
+        try:
+            return super()._commit()
+        finally:
+            self.release_write_lock()
+
+    def _rollback(self):
+        try:
+            return super()._rollback()
+        finally:
+            self.release_write_lock()
+
+    def _close(self):
+        try:
+            return super()._close()
+        finally:
+            self.release_write_lock()
@@ -1,3 +1,65 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from social_media_api.throttling import CacheWindowStore, MemoryWindowStore, memory_store
+
+
+class SlidingWindowTestCase(TestCase):
+    """
+    Tests for the sliding-window counters behind the API throttle.
+    """
+
+    def check_store(self, store):
+        # 3 requests per 10 seconds
+        self.assertEqual([store.acquire('k', 3, 10, 100.0 + i)[0] for i in range(4)], [True, True, True, False])
+        # Half way through the next window the three old requests still weigh 1.5
+        self.assertEqual([store.acquire('k', 3, 10, 115.0)[0] for _ in range(2)], [True, True])
+        allowed, wait = store.acquire('k', 3, 10, 115.0)
+        self.assertFalse(allowed)
+        self.assertGreater(wait, 0)
+        # Two windows later nothing is left
+        self.assertTrue(store.acquire('k', 3, 10, 130.0)[0])
+        self.assertTrue(store.acquire('other', 3, 10, 103.0)[0])
+
+    def test_memory_store(self):
+        self.check_store(MemoryWindowStore())
+
+    def test_cache_store(self):
+        self.check_store(CacheWindowStore())
+
+    def test_memory_store_drops_least_recent_clients(self):
+        store = MemoryWindowStore(max_keys=2)
+        store.acquire('a', 3, 10, 0.0)
+        store.acquire('b', 3, 10, 0.0)
+        store.acquire('a', 3, 10, 1.0)
+        store.acquire('c', 3, 10, 2.0)
+        self.assertEqual(list(store.windows), ['a', 'c'])
+        self.assertEqual(store.windows['a'][1], 2)
+
+
+class LoginThrottleTestCase(TestCase):
+    """
+    Tests for the per-view, per-client throttle on the login endpoint.
+    """
+
+    def setUp(self):
+        memory_store.clear()
+
+    @override_settings(REST_FRAMEWORK={
+        'DEFAULT_THROTTLE_CLASSES': ['social_media_api.throttling.SlidingWindowThrottle'],
+        'DEFAULT_THROTTLE_RATES': {'login': '2/min'},
+    })
+    def test_login_is_throttled_per_client(self):
+        """
+        Test that a client over the login rate gets 429 without touching the database.
+        """
+        client = APIClient()
+        for _ in range(2):
+            self.assertEqual(client.post('/api/accounts/login', {'username': 'x', 'password': 'y'}).status_code, 400)
+        with self.assertNumQueries(0):
+            response = client.post('/api/accounts/login', {'username': 'x', 'password': 'y'})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+
+        other = APIClient(REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(other.post('/api/accounts/login', {'username': 'x', 'password': 'y'}).status_code, 400)
@@ -10,6 +10,7 @@ from .serializers import RegisterSerializer, UserProfileSerializer
 
 class RegisterView(APIView):
     permission_classes = [AllowAny]
+    throttle_scope = 'login'
 
     def post(self, request):
         serializer = RegisterSerializer(data=request.data)
@@ -21,6 +22,7 @@ class RegisterView(APIView):
 
 class LoginView(APIView):
     permission_classes = [AllowAny]
+    throttle_scope = 'login'
 
     def post(self, request):
         user = authenticate(
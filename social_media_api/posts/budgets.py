@@ -0,0 +1,30 @@
+from django.contrib.auth import get_user_model
+
+from .models import Post, Comment
+
+AUTHORS = 20
+POSTS_PER_AUTHOR = 10
+COMMENTS_PER_POST = 3
+
+
+def seed():
+    """Data the performance budgets are checked against: a reader following busy authors."""
+    User = get_user_model()
+    # Unusable passwords keep the password hasher out of the seeding time
+    User.objects.bulk_create(User(username=f'budget-author-{i}', password='!') for i in range(AUTHORS))
+    authors = list(User.objects.filter(username__startswith='budget-author-'))
+    reader = User.objects.create(username='budget-reader', password='!')
+    reader.following.add(*authors)
+
+    Post.objects.bulk_create(
+        Post(author=author, title=f'Post {i} by {author.username}', content='Budget post. ' * 20)
+        for author in authors
+        for i in range(POSTS_PER_AUTHOR)
+    )
+    posts = list(Post.objects.all())
+    Comment.objects.bulk_create(
+        Comment(post=post, author=authors[(post.pk + i) % AUTHORS], content=f'Comment {i}')
+        for post in posts
+        for i in range(COMMENTS_PER_POST)
+    )
+    return {'user': reader, 'post': posts[0]}
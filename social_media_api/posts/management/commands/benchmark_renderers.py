@@ -0,0 +1,43 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from posts.models import Post
+from posts.serializers import PostSerializer
+from social_media_api.renderers import compare_renderers
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare encode time and payload size of a FeedView response across the JSON, "
+        "orjson and MessagePack renderers, on a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1000, help="Posts in the feed response.")
+        parser.add_argument('--repeat', type=int, default=20, help="Encodes per renderer; the best one is reported.")
+
+    def handle(self, *args, **options):
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            data = self.feed_data(options['posts'])
+            self.stdout.write(f"FeedView response with {len(data)} posts")
+            for result in compare_renderers(data, options['repeat']):
+                self.stdout.write(
+                    f"{result['renderer']:<22} {result['media_type']:<22} {result['ms']:>9.3f} ms  {result['bytes']:>10,} bytes"
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def feed_data(self, posts):
+        User = get_user_model()
+        reader = User.objects.create(username='bench-reader')
+        authors = User.objects.bulk_create(User(username=f'bench-author-{i}') for i in range(20))
+        reader.following.add(*authors)
+        Post.objects.bulk_create(
+            Post(author=authors[i % len(authors)], title=f'Post {i}', content=f'Post {i} body. ' * 20)
+            for i in range(posts)
+        )
+        # Same data FeedView builds for the reader
+        feed = Post.objects.filter(author__in=reader.following.all()).select_related('author').order_by('-created_at')
+        return PostSerializer(feed, many=True).data
@@ -0,0 +1,153 @@
+import random
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections
+
+from posts.models import Comment, Post
+from social_media_api.database import database_settings
+
+USERS = 50
+POSTS = 200
+
+
+def variants(directory):
+    """Database settings compared, keyed by label."""
+    tuned = database_settings(directory, environ={'DATABASE_PROFILE': 'sqlite-wal'})
+    return {
+        'default': {'ENGINE': 'django.db.backends.sqlite3', 'OPTIONS': {}, 'CONN_MAX_AGE': 0},
+        'WAL pragmas': dict(tuned, ENGINE='django.db.backends.sqlite3'),
+        'WAL + write queue': tuned,
+    }
+
+
+# --------------------------
+# Workload
+# --------------------------
+# The writes of PostViewSet.create, CommentViewSet.create and FollowUser, the
+# last of which reads before it writes inside a transaction
+def create_post(alias, rng):
+    Post.objects.using(alias).create(author_id=rng.randint(1, USERS), title='Benchmark', content='Body ' * 40)
+
+
+def create_comment(alias, rng):
+    Comment.objects.using(alias).create(
+        post_id=rng.randint(1, POSTS), author_id=rng.randint(1, USERS), content='Comment ' * 10
+    )
+
+
+def follow(alias, rng):
+    User = get_user_model()
+    user = User.objects.using(alias).get(pk=rng.randint(1, USERS))
+    target = User.objects.using(alias).get(pk=rng.randint(1, USERS))
+    if user != target:
+        user.following.add(target)
+        if rng.random() < 0.5:
+            user.following.remove(target)
+
+
+def read_feed(alias, rng):
+    following = get_user_model().objects.using(alias).get(pk=rng.randint(1, USERS)).following.all()
+    list(Post.objects.using(alias).filter(author__in=following).select_related('author').order_by('-created_at')[:20])
+
+
+WRITES = (create_post, create_comment, follow)
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.write_ms = []
+        self.reads = 0
+        self.errors = 0
+
+
+class Command(BaseCommand):
+    help = (
+        "Run concurrent writers (posts, comments, follows) and feed readers against "
+        "SQLite with the default settings, with the WAL pragmas, and with the full "
+        "sqlite-wal profile, and compare throughput, latency and lock errors."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8)
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--seconds', type=float, default=5)
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{options['writers']} writer and {options['readers']} reader threads, {options['seconds']:g} s each"
+        )
+        self.stdout.write(f"{'':<18} {'writes/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'reads/s':>9} {'lock errors':>12}")
+        with tempfile.TemporaryDirectory() as directory:
+            for index, (label, variant) in enumerate(variants(Path(directory)).items()):
+                alias = f'benchmark_{index}'
+                connections.settings[alias] = {
+                    **connections.settings['default'], **variant, 'NAME': Path(directory) / f'{alias}.sqlite3',
+                }
+                try:
+                    self.prepare(alias)
+                    stats = self.run(alias, options)
+                finally:
+                    connections[alias].close()
+                    del connections[alias]
+                    del connections.settings[alias]
+                self.report(label, stats, options['seconds'])
+
+    def prepare(self, alias):
+        call_command('migrate', database=alias, verbosity=0)
+        User = get_user_model()
+        User.objects.using(alias).bulk_create(User(username=f'user-{i}', password='!') for i in range(USERS))
+        Post.objects.using(alias).bulk_create(
+            Post(author_id=i % USERS + 1, title=f'Post {i}', content='Body') for i in range(POSTS)
+        )
+
+    def run(self, alias, options):
+        stats, stop = Stats(), threading.Event()
+        threads = [
+            threading.Thread(target=self.work, args=(alias, index, stats, stop, True))
+            for index in range(options['writers'])
+        ] + [
+            threading.Thread(target=self.work, args=(alias, -index - 1, stats, stop, False))
+            for index in range(options['readers'])
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(options['seconds'])
+        stop.set()
+        for thread in threads:
+            thread.join()
+        return stats
+
+    def work(self, alias, seed, stats, stop, writer):
+        rng = random.Random(seed)
+        try:
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    rng.choice(WRITES)(alias, rng) if writer else read_feed(alias, rng)
+                except OperationalError:
+                    with stats.lock:
+                        stats.errors += 1
+                    continue
+                with stats.lock:
+                    if writer:
+                        stats.write_ms.append((time.perf_counter() - start) * 1000)
+                    else:
+                        stats.reads += 1
+        finally:
+            connections[alias].close()
+
+    def report(self, label, stats, seconds):
+        write_ms = sorted(stats.write_ms) or [0.0]
+        self.stdout.write(
+            f"{label:<18} {len(stats.write_ms) / seconds:>9.0f} {statistics.median(write_ms):>8.1f} "
+            f"{write_ms[int(len(write_ms) * 0.99) - 1 if len(write_ms) > 1 else 0]:>8.1f} "
+            f"{stats.reads / seconds:>9.0f} {stats.errors:>12}"
+        )
@@ -0,0 +1 @@
+../../../../django_perf/budget_report.py
\ No newline at end of file
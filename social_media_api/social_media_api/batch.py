@@ -0,0 +1,122 @@
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections
+from django.urls import Resolver404, resolve
+from rest_framework import serializers, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Outer request headers sub-requests must not inherit
+DROPPED_META = ('CONTENT_TYPE', 'CONTENT_LENGTH', 'HTTP_IDEMPOTENCY_KEY', 'wsgi.input')
+
+
+class SubRequestSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=['GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH', 'DELETE'], default='GET')
+    path = serializers.RegexField(r'^/', max_length=2000)
+    body = serializers.JSONField(required=False)
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = SubRequestSerializer(many=True, allow_empty=False)
+
+    def validate_requests(self, value):
+        if len(value) > settings.BATCH_MAX_REQUESTS:
+            raise serializers.ValidationError(f"At most {settings.BATCH_MAX_REQUESTS} requests per batch.")
+        return value
+
+
+class BatchView(APIView):
+    """
+    Runs a list of API calls in one round trip:
+
+        POST /api/batch/ {"requests": [{"method": "GET", "path": "/api/feed/"}, ...]}
+
+    Only paths under BATCH_PATH_PREFIX can be batched. Sub-requests are resolved
+    and dispatched in process, skipping the middleware
+    stack, and reuse the batch's authentication instead of authenticating again.
+    Consecutive reads run concurrently; a write waits for the reads before it and
+    the requests after it wait for the write. Responses come back in request order.
+    """
+    permission_classes = [IsAuthenticated]
+    throttle_scope = 'batch'
+
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        specs = serializer.validated_data['requests']
+
+        results = [None] * len(specs)
+        reads = []
+        for index, spec in enumerate(specs):
+            if spec['method'] in SAFE_METHODS:
+                reads.append(index)
+                continue
+            self.run_reads(request, specs, reads, results)
+            reads = []
+            results[index] = self.dispatch_sub_request(request, spec)
+        self.run_reads(request, specs, reads, results)
+        return Response({'responses': results}, status=status.HTTP_200_OK)
+
+    def run_reads(self, request, specs, indexes, results):
+        if len(indexes) < 2 or settings.BATCH_MAX_WORKERS < 2:
+            for index in indexes:
+                results[index] = self.dispatch_sub_request(request, specs[index])
+            return
+        with ThreadPoolExecutor(max_workers=min(settings.BATCH_MAX_WORKERS, len(indexes))) as pool:
+            for index, result in zip(indexes, pool.map(
+                lambda index: self.dispatch_in_thread(request, specs[index]), indexes
+            )):
+                results[index] = result
+
+    def dispatch_in_thread(self, request, spec):
+        # Worker threads open their own database connections. The threads are thrown
+        # away, so their connections are closed whatever CONN_MAX_AGE says
+        try:
+            return self.dispatch_sub_request(request, spec)
+        finally:
+            connections.close_all()
+
+    def dispatch_sub_request(self, request, spec):
+        path, _, query = spec['path'].partition('?')
+        if not path.startswith(settings.BATCH_PATH_PREFIX):
+            return {'status': status.HTTP_400_BAD_REQUEST,
+                    'body': {'detail': f'Only paths under {settings.BATCH_PATH_PREFIX} can be batched.'}}
+        try:
+            match = resolve(path)
+        except Resolver404:
+            return {'status': status.HTTP_404_NOT_FOUND, 'body': {'detail': 'Not found.'}}
+        if getattr(match.func, 'view_class', None) is BatchView:
+            return {'status': status.HTTP_400_BAD_REQUEST, 'body': {'detail': 'Batches cannot be nested.'}}
+
+        body = json.dumps(spec['body']).encode() if 'body' in spec else b''
+        environ = {key: value for key, value in request.META.items() if key not in DROPPED_META}
+        environ.update({
+            'REQUEST_METHOD': spec['method'],
+            'PATH_INFO': path,
+            'QUERY_STRING': query,
+            'CONTENT_TYPE': 'application/json',
+            'CONTENT_LENGTH': str(len(body)),
+            'HTTP_ACCEPT': 'application/json',  # bodies are embedded in the JSON batch response
+            'wsgi.input': io.BytesIO(body),
+        })
+        sub_request = WSGIRequest(environ)
+        # DRF picks these up and skips its authenticators (see rest_framework.request)
+        sub_request._force_auth_user = request.user
+        sub_request._force_auth_token = request.auth
+        sub_request.user = request.user
+
+        response = match.func(sub_request, *match.args, **match.kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        content_type = response.get('Content-Type', '')
+        content = response.content.decode(response.charset or 'utf-8') if response.content else None
+        if content and content_type.startswith('application/json'):
+            content = json.loads(content)
+        return {'status': response.status_code, 'body': content}
@@ -0,0 +1,85 @@
+import hashlib
+import zlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+
+# Bodies at least this large are stored zlib-compressed
+COMPRESS_MIN_BYTES = 1024
+
+# Seconds a request holds its key while it runs; a retry arriving meanwhile gets 409
+IN_FLIGHT_TIMEOUT = 60
+
+MAX_KEY_LENGTH = 255
+
+# Response headers replayed along with the status and body
+REPLAYED_HEADERS = ('Location', 'Content-Type')
+
+# Error statuses a retry of the same request would get again. Throttling (429),
+# authentication (401/403) and conflicts (409) can change before a retry, so those
+# responses aren't stored and leave the key free
+STORED_ERROR_STATUSES = (400, 404, 422)
+
+
+class IdempotencyMiddleware:
+    """
+    Makes POSTs that carry an `Idempotency-Key` header safe to retry.
+
+    The first response for a key (a 2xx, or a 400/404/422) is kept in the cache for
+    IDEMPOTENCY_KEY_TTL seconds and replayed for retries with the same key, path and
+    credentials, before any view, serializer or query runs. Reusing a key for a
+    different body is a 422.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        key = request.META.get('HTTP_IDEMPOTENCY_KEY')
+        if request.method != 'POST' or not key:
+            return self.get_response(request)
+        if len(key) > MAX_KEY_LENGTH:
+            return JsonResponse({'detail': f'Idempotency-Key is longer than {MAX_KEY_LENGTH} characters.'}, status=400)
+
+        # Middleware runs before DRF authenticates, so clients are told apart by their
+        # raw credentials (token header, session cookie) or address
+        client = (request.META.get('HTTP_AUTHORIZATION')
+                  or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+                  or request.META.get('REMOTE_ADDR', ''))
+        cache_key = 'idempotency:' + hashlib.sha256(f'{client}|{request.path}|{key}'.encode()).hexdigest()
+        fingerprint = hashlib.sha256(request.body).hexdigest()[:32]
+
+        stored = cache.get(cache_key)
+        if stored is not None:
+            return self.replay(stored, fingerprint)
+        if not cache.add(f'{cache_key}:in-flight', 1, IN_FLIGHT_TIMEOUT):
+            return JsonResponse({'detail': 'A request with this Idempotency-Key is still in progress.'}, status=409)
+        try:
+            response = self.get_response(request)
+            if self.storable(response):
+                cache.set(cache_key, self.pack(response, fingerprint), settings.IDEMPOTENCY_KEY_TTL)
+        finally:
+            cache.delete(f'{cache_key}:in-flight')
+        return response
+
+    def storable(self, response):
+        if response.streaming:
+            return False
+        return 200 <= response.status_code < 300 or response.status_code in STORED_ERROR_STATUSES
+
+    def pack(self, response, fingerprint):
+        content = response.content
+        compressed = len(content) >= COMPRESS_MIN_BYTES
+        headers = {name: response[name] for name in REPLAYED_HEADERS if response.has_header(name)}
+        return (fingerprint, response.status_code, headers, compressed, zlib.compress(content) if compressed else content)
+
+    def replay(self, stored, fingerprint):
+        stored_fingerprint, status, headers, compressed, content = stored
+        if stored_fingerprint != fingerprint:
+            return JsonResponse(
+                {'detail': 'This Idempotency-Key was already used for a different request body.'}, status=422
+            )
+        response = HttpResponse(zlib.decompress(content) if compressed else content, status=status, headers=headers)
+        response['Idempotent-Replayed'] = 'true'
+        return response
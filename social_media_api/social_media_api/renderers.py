@@ -0,0 +1,99 @@
+import time
+from importlib.util import find_spec
+
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.utils.encoders import JSONEncoder
+
+# Both libraries are optional; settings only lists the classes below when their
+# library is installed (pip install orjson msgpack)
+HAS_ORJSON = find_spec('orjson') is not None
+HAS_MSGPACK = find_spec('msgpack') is not None
+
+if HAS_ORJSON:
+    import orjson
+if HAS_MSGPACK:
+    import msgpack
+
+# Types orjson/msgpack don't know (Decimal, lazy strings, querysets...) are converted
+# the way DRF's JSONRenderer converts them
+_encoder = JSONEncoder()
+
+
+# --------------------------
+# ORJSON
+# --------------------------
+class ORJSONRenderer(renderers.BaseRenderer):
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=_encoder.default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONParser(BaseParser):
+    media_type = 'application/json'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+# --------------------------
+# MessagePack
+# --------------------------
+class MessagePackRenderer(renderers.BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_encoder.default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (msgpack.ExtraData, msgpack.FormatError, msgpack.StackError, ValueError) as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
+
+
+# --------------------------
+# Benchmark
+# --------------------------
+def compare_renderers(data, repeat=20):
+    """Best encode time and payload size of `data` for every available renderer."""
+    candidates = [renderers.JSONRenderer]
+    if HAS_ORJSON:
+        candidates.append(ORJSONRenderer)
+    if HAS_MSGPACK:
+        candidates.append(MessagePackRenderer)
+
+    results = []
+    for renderer_class in candidates:
+        renderer = renderer_class()
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            payload = renderer.render(data, renderer.media_type, {})
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results.append({
+            'renderer': renderer_class.__name__,
+            'media_type': renderer.media_type,
+            'ms': round(best * 1000, 3),
+            'bytes': len(payload),
+        })
+    return results
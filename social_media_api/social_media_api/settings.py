@@ -10,8 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+from importlib.util import find_spec
 from pathlib import Path
 
+from .database import database_settings
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -44,6 +48,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'social_media_api.database.DatabaseMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -51,6 +56,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'social_media_api.idempotency.IdempotencyMiddleware',
 ]
 
 ROOT_URLCONF = 'social_media_api.urls'
@@ -77,13 +83,15 @@ WSGI_APPLICATION = 'social_media_api.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# DATABASE_PROFILE=dev (SQLite, the default), persistent or pooled (PostgreSQL at
+# DATABASE_URL); see social_media_api/database.py for the pool and lifetime knobs
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_settings(BASE_DIR),
 }
 
+# Seconds between the connection and pool metrics DatabaseMetricsMiddleware logs
+DATABASE_METRICS_INTERVAL = 60
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -126,7 +134,24 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Faster wire formats when their libraries are installed: orjson for JSON, and
+# MessagePack (Accept: application/msgpack) as a binary alternative
+RENDERER_CLASSES = ['rest_framework.renderers.JSONRenderer', 'rest_framework.renderers.BrowsableAPIRenderer']
+PARSER_CLASSES = [
+    'rest_framework.parsers.JSONParser',
+    'rest_framework.parsers.FormParser',
+    'rest_framework.parsers.MultiPartParser',
+]
+if find_spec('orjson'):
+    RENDERER_CLASSES.insert(0, 'social_media_api.renderers.ORJSONRenderer')
+    PARSER_CLASSES.insert(0, 'social_media_api.renderers.ORJSONParser')
+if find_spec('msgpack'):
+    RENDERER_CLASSES.append('social_media_api.renderers.MessagePackRenderer')
+    PARSER_CLASSES.append('social_media_api.renderers.MessagePackParser')
+
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': RENDERER_CLASSES,
+    'DEFAULT_PARSER_CLASSES': PARSER_CLASSES,
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.TokenAuthentication',
     ],
@@ -135,7 +160,40 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    'DEFAULT_THROTTLE_CLASSES': [
+        'social_media_api.throttling.SlidingWindowThrottle',
+    ],
+    # Per scope: views set throttle_scope, the others fall back to user/anon
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': '60/min',
+        'user': '600/min',
+        'feed': '120/min',
+        'login': '10/min',
+        'batch': '60/min',
+    },
 }
 
+# POST /api/batch/: most sub-requests per batch, threads running its reads, and the
+# prefix every sub-request path must start with
+BATCH_MAX_REQUESTS = 20
+BATCH_MAX_WORKERS = 4
+BATCH_PATH_PREFIX = '/api/'
+
+# POSTs with an Idempotency-Key header replay their first response for this long
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60
+
+# Throttle counters live in process memory; 'cache' shares them through CACHES
+# between processes
+THROTTLE_BACKEND = 'memory'
+
+# Performance budgets declared on the views with @budget; see social_media_api/budgets.py
+TEST_RUNNER = 'social_media_api.budgets.BudgetTestRunner'
+BUDGET_SEED = 'posts.budgets.seed'
+BUDGET_CLIENT = 'rest_framework.test.APIClient'
+BUDGET_REPEAT = 5
+BUDGET_HISTORY = BASE_DIR / 'budget_history.jsonl'
+# Scales every latency budget, for machines slower than the ones budgets were set
+# on; CI runners (CI set) default to 3
+BUDGET_LATENCY_FACTOR = float(os.environ.get('BUDGET_LATENCY_FACTOR', 3 if os.environ.get('CI') else 1))
 
 AUTH_USER_MODEL = 'accounts.User'
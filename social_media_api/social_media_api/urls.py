@@ -16,10 +16,12 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
+from .batch import BatchView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/accounts/', include('accounts.urls')),
+    path('api/batch/', BatchView.as_view(), name='batch'),
     path('api/', include('posts.urls')),
 ]
 